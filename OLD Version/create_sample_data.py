@@ -33,23 +33,21 @@ months_2024 = ['ene-24', 'feb-24']
 all_months = months_2021 + months_2022 + months_2023 + months_2024
 
 # Generate random but realistic data for additional months
-np.random.seed(42)
-for month in all_months:
-    data[month] = [
-        round(np.random.uniform(100, 700), 1),      # Ore Mined RGM
-        round(np.random.uniform(2000, 4000), 1),    # Overburden RGM
-        round(np.random.uniform(50, 400), 1),       # Ore Mined Sar
-        round(np.random.uniform(200, 1500), 1),     # Overburden Sar
-        int(np.random.uniform(650, 900)),           # Fleet Count
-        int(np.random.uniform(3000000, 6000000))    # Diesel
-    ]
+# Bounds per row: Ore RGM, Overburden RGM, Ore Sar, Overburden Sar, Fleet, Diesel
+lows = np.array([100, 2000, 50, 200, 650, 3000000])
+highs = np.array([700, 4000, 400, 1500, 900, 6000000])
+values = np.random.default_rng(42).uniform(lows, highs, size=(len(all_months), len(lows)))
+tonnes = values[:, :4].round(1)
+counts = values[:, 4:].astype(int)
+for i, month in enumerate(all_months):
+    data[month] = tonnes[i].tolist() + counts[i].tolist()
 
 # Create DataFrame
 df = pd.DataFrame(data)
 
 # Save to Excel
 output_file = '/mnt/user-data/outputs/sample_mining_data.xlsx'
-with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
     df.to_excel(writer, sheet_name='Mining_Data', index=False)
     
     # Add a second sheet with metadata
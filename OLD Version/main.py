@@ -6,24 +6,32 @@ import numpy as np
 file_path = 'RGM-Fuel-and-Haulage-data-20-24.xlsx'
 df = pd.read_excel(file_path)
 
-# Preparar los datos (asumiendo que la primera columna contiene categorías y el resto son meses)
+# Preparar los datos (columnas: Métrica, Categoría, Unidad y luego un mes por columna)
 # Ajusta según la estructura real de tu archivo
-df_transposed = df.set_index(df.columns[0]).T
-
-# Convertir el índice a fechas si es necesario
-df_transposed.index = pd.to_datetime(df_transposed.index)
+date_cols = df.columns[3:]
+dates = pd.to_datetime(date_cols)
+metrics = df[df.columns[0]].astype(str).str.strip()
+categories = df[df.columns[1]].astype(str).str.strip()
+
+def series(metric, category=None):
+    """Extrae la fila de una métrica como serie temporal, sin transponer el DataFrame"""
+    mask = metrics == metric
+    if category is not None:
+        mask &= categories == category
+    row = df.loc[mask, date_cols].iloc[0]
+    return pd.Series(row.to_numpy(dtype=float), index=dates)
 
 # ----- GRÁFICA 1: Barras agrupadas para Ore Mined y Overburden -----
 fig, ax = plt.subplots(figsize=(14, 6))
 
 # Extraer las categorías de interés
-ore_mined_rgm = df_transposed['Ore Mined']['RGM']
-overburden_rgm = df_transposed['Overburden']['RGM']
-ore_mined_sar = df_transposed['Ore Mined']['Sar']
-overburden_sar = df_transposed['Overburden']['Sar']
+ore_mined_rgm = series('Ore Mined', 'RGM')
+overburden_rgm = series('Overburden', 'RGM')
+ore_mined_sar = series('Ore Mined', 'Sar')
+overburden_sar = series('Overburden', 'Sar')
 
 # Configurar posiciones de las barras
-x = np.arange(len(df_transposed.index))
+x = np.arange(len(dates))
 width = 0.2
 
 # Crear barras agrupadas
@@ -37,7 +45,7 @@ ax.set_xlabel('Mes', fontsize=12, fontweight='bold')
 ax.set_ylabel('Kilotoneladas (kt)', fontsize=12, fontweight='bold')
 ax.set_title('Ore Mined y Overburden por Mes (RGM y Sar)', fontsize=14, fontweight='bold')
 ax.set_xticks(x)
-ax.set_xticklabels(df_transposed.index.strftime('%Y-%m'), rotation=45, ha='right')
+ax.set_xticklabels(dates.strftime('%Y-%m'), rotation=45, ha='right')
 ax.legend()
 ax.grid(axis='y', alpha=0.3)
 
@@ -49,20 +57,20 @@ plt.show()
 fig, ax1 = plt.subplots(figsize=(14, 6))
 
 # Eje izquierdo: Consumo de Diesel
-diesel = df_transposed['Liter of Diesel Consumed']
+diesel = series('Liter of Diesel Consumed')
 color1 = '#21808d'
 ax1.set_xlabel('Mes', fontsize=12, fontweight='bold')
 ax1.set_ylabel('Litros de Diesel Consumido', fontsize=12, fontweight='bold', color=color1)
-ax1.plot(df_transposed.index, diesel, color=color1, marker='o', linewidth=2, label='Diesel Consumido')
+ax1.plot(dates, diesel, color=color1, marker='o', linewidth=2, label='Diesel Consumido')
 ax1.tick_params(axis='y', labelcolor=color1)
 ax1.grid(alpha=0.3)
 
 # Eje derecho: Flota Activa
 ax2 = ax1.twinx()
-fleet = df_transposed['Active Fleet Count (Aprox)']
+fleet = series('Active Fleet Count (Aprox)')
 color2 = '#a84b2f'
 ax2.set_ylabel('Flota Activa (Aprox)', fontsize=12, fontweight='bold', color=color2)
-ax2.plot(df_transposed.index, fleet, color=color2, marker='s', linewidth=2, label='Flota Activa')
+ax2.plot(dates, fleet, color=color2, marker='s', linewidth=2, label='Flota Activa')
 ax2.tick_params(axis='y', labelcolor=color2)
 
 # Título
@@ -81,7 +89,7 @@ fig, ax1 = plt.subplots(figsize=(14, 6))
 # Barras: Total Ore Mined
 total_ore_mined = ore_mined_rgm + ore_mined_sar
 color1 = '#21808d'
-ax1.bar(df_transposed.index, total_ore_mined, color=color1, alpha=0.7, label='Total Ore Mined')
+ax1.bar(dates, total_ore_mined, color=color1, alpha=0.7, label='Total Ore Mined')
 ax1.set_xlabel('Mes', fontsize=12, fontweight='bold')
 ax1.set_ylabel('Ore Mined (kt)', fontsize=12, fontweight='bold', color=color1)
 ax1.tick_params(axis='y', labelcolor=color1)
@@ -89,7 +97,7 @@ ax1.tick_params(axis='y', labelcolor=color1)
 # Línea: Diesel Consumido
 ax2 = ax1.twinx()
 color2 = '#c0152f'
-ax2.plot(df_transposed.index, diesel, color=color2, marker='o', linewidth=2, label='Diesel Consumido')
+ax2.plot(dates, diesel, color=color2, marker='o', linewidth=2, label='Diesel Consumido')
 ax2.set_ylabel('Litros de Diesel', fontsize=12, fontweight='bold', color=color2)
 ax2.tick_params(axis='y', labelcolor=color2)
 
@@ -8,41 +8,79 @@ Version: FINAL
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as OpenpyxlImage
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl import load_workbook
+import hashlib
+import importlib.util
+import io
 import os
 import sys
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
-warnings.filterwarnings('ignore')
 
-# Try to import tkinter for GUI mode
-try:
-    import tkinter as tk
-    from tkinter import filedialog, messagebox, ttk
-    import threading
-    GUI_AVAILABLE = True
-except ImportError:
-    GUI_AVAILABLE = False
+# tkinter is only imported when the GUI starts; command-line runs skip it.
+# Probe the _tkinter C extension: the tkinter package exists even on builds without Tk
+GUI_AVAILABLE = importlib.util.find_spec('_tkinter') is not None
+if not GUI_AVAILABLE:
     print("Note: GUI mode not available. Running in command-line mode.")
 
-# Set matplotlib to non-interactive backend
-plt.switch_backend('Agg')
+def _load_gui():
+    """Import the tkinter modules the GUI needs into this module"""
+    global tk, filedialog, messagebox, threading
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    import threading
 
-# Set style
-try:
-    plt.style.use('seaborn-v0_8-darkgrid')
-except:
+def _use_chart_style():
+    """Apply the chart style; matplotlib is imported on first chart, not at startup"""
+    import matplotlib.style
     try:
-        plt.style.use('seaborn-darkgrid')
+        matplotlib.style.use('seaborn-v0_8-darkgrid')
     except:
-        pass  # Use default style
+        try:
+            matplotlib.style.use('seaborn-darkgrid')
+        except:
+            pass  # Use default style
+
+# Fixed margins for the 2x2 chart grids (avoids tight_layout/bbox re-renders)
+CHART_MARGINS = dict(left=0.06, right=0.95, top=0.92, bottom=0.09, hspace=0.45, wspace=0.25)
+
+# JPEG encodes much faster than PNG; the images are resized in Excel anyway.
+# The dpi is written into the JPEG so Excel sizes the figure in inches, not at 96 dpi
+CHART_DPI = 90
+CHART_JPEG = dict(quality=85, optimize=False, dpi=(CHART_DPI, CHART_DPI))
+
+# Excel shows the 15x10in figures at 96 dpi; scale them to 1100x750 px
+CHART_IMAGE_SCALE = {'x_scale': 1100 / (15 * 96), 'y_scale': 750 / (10 * 96)}
 
+# Processed data is cached as Parquet, which loads without running code, so only
+# when pyarrow is installed; bump CACHE_VERSION when process_data changes its output
+CACHE_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+CACHE_VERSION = 1
+
+_chart_fig = None
+
+def _chart_grid():
+    """Return a cleared 2x2 grid, reusing this process's chart figure"""
+    global _chart_fig
+    if _chart_fig is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _use_chart_style()
+        # Built outside pyplot so no global figure registry pins it
+        _chart_fig = Figure(figsize=(15, 10), dpi=CHART_DPI)
+        FigureCanvasAgg(_chart_fig)
+    else:
+        _chart_fig.clear()
+    return _chart_fig, _chart_fig.subplots(2, 2)
+
+def _chart_bytes(fig):
+    """Encode a chart figure in memory straight from the Agg buffer"""
+    from PIL import Image
+    fig.canvas.draw()
+    buf = io.BytesIO()
+    Image.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert('RGB').save(buf, 'JPEG', **CHART_JPEG)
+    return buf.getvalue()
 
 class MiningDataProcessor:
     """Core data processor for mining data analysis"""
@@ -53,16 +91,27 @@ class MiningDataProcessor:
         self.output_file = output_file
         self.df = None
         self.clean_df = None
-        self.temp_dir = tempfile.mkdtemp()
-        self.chart_files = []
+        self.chart_df = None
+        self.totals = {}
+        self.dates = None
+        self.arrays = {}
+        self.have = frozenset()
+        self.tick_labels = []
+        self.chart_images = []
         
     def process(self):
         """Main processing pipeline"""
-        print("📂 Loading data...")
-        self.load_data()
-        
-        print("🔧 Processing data...")
-        self.process_data()
+        cache_file = self._cache_path() if CACHE_AVAILABLE else None
+        if cache_file and self._load_cache(cache_file):
+            print("📦 Using cached data...")
+        else:
+            print("📂 Loading data...")
+            self.load_data()
+            
+            print("🔧 Processing data...")
+            self.process_data()
+            if cache_file:
+                self._save_cache(cache_file)
         
         print("📊 Generating charts...")
         self.create_charts()
@@ -73,28 +122,93 @@ class MiningDataProcessor:
         print(f"✅ Success! Output file: {output}")
         return output
         
+    def _cache_path(self):
+        """Cache file beside the input, keyed on its contents, sheet and the processing version"""
+        digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        with open(self.input_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(str(self.sheet_name).encode())
+        return f"{self.input_file}.{digest.hexdigest()[:16]}.parquet"
+        
+    def _load_cache(self, cache_file):
+        """Restore clean data from a previous run of the same file"""
+        if not os.path.exists(cache_file):
+            return False
+        try:
+            self.clean_df = pd.read_parquet(cache_file, engine='pyarrow')
+        except (OSError, ValueError):
+            return False  # Unreadable or corrupt cache; reprocess the workbook
+        self._prepare_chart_data()
+        return True
+        
+    def _save_cache(self, cache_file):
+        """Store clean data for later runs"""
+        try:
+            self.clean_df.to_parquet(cache_file, engine='pyarrow')
+        except (OSError, ValueError):
+            pass  # Input folder not writable or data not storable; skip caching
+        
     def load_data(self):
         """Load Excel data"""
-        if self.sheet_name:
-            self.df = pd.read_excel(self.input_file, sheet_name=self.sheet_name)
-        else:
-            excel_file = pd.ExcelFile(self.input_file)
+        # Readers warn about unsupported workbook features (validation, styles)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            if self.input_file.lower().endswith(('.xlsx', '.xlsm')):
+                self.df = self._read_xlsx_rows()
+            else:
+                self.df = self._read_legacy_excel()
+
+    def _read_legacy_excel(self):
+        """Read legacy formats (.xls) through pandas"""
+        with pd.ExcelFile(self.input_file) as excel_file:
+            if self.sheet_name:
+                return excel_file.parse(self.sheet_name)
             sheets = excel_file.sheet_names
             print(f"   Found sheets: {', '.join(sheets)}")
-            self.df = pd.read_excel(self.input_file, sheet_name=sheets[0])
             print(f"   Using sheet: {sheets[0]}")
-            
+            return excel_file.parse(sheets[0])
+
+    def _read_xlsx_rows(self):
+        """Read raw cell values with openpyxl in read-only mode"""
+        wb = load_workbook(self.input_file, read_only=True, data_only=True, keep_links=False)
+        try:
+            if self.sheet_name:
+                ws = wb[self.sheet_name]
+            else:
+                sheets = wb.sheetnames
+                print(f"   Found sheets: {', '.join(sheets)}")
+                ws = wb[sheets[0]]
+                print(f"   Using sheet: {sheets[0]}")
+            rows = list(ws.iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+        # Drop trailing blank rows (read-only sheets may report extra ones)
+        while rows and all(val is None for val in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+        
+        # Rename repeated headers as read_excel does ('ene-20', 'ene-20.1', ...)
+        header, counts = [], {}
+        for name in rows[0]:
+            label = name
+            while label is not None and label in counts:
+                counts[name] += 1
+                label = f'{name}.{counts[name]}'
+            counts.setdefault(label, 0)
+            header.append(label)
+        return pd.DataFrame(rows[1:], columns=header)
+
     def process_data(self):
         """Process and clean the data"""
         # Find header row with date columns
-        header_row = None
-        for idx in range(min(10, len(self.df))):
-            row_values = self.df.iloc[idx].astype(str).values
-            if any(any(month in val.lower() for month in ['ene-', 'feb-', 'mar-', 'abr-', 'may-', 'jun-', 
-                                                          'jul-', 'ago-', 'sep-', 'oct-', 'nov-', 'dic-'])
-                  for val in row_values):
-                header_row = idx
-                break
+        month_pattern = r'(?:ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)-'
+        top = self.df.head(10).astype(str)
+        hits = top.apply(lambda col: col.str.contains(month_pattern, case=False, regex=True, na=False))
+        hits = hits.any(axis=1).to_numpy()
+        header_row = int(hits.argmax()) if hits.any() else None
         
         # Set proper column names
         if header_row is not None and header_row > 0:
@@ -106,66 +220,86 @@ class MiningDataProcessor:
                           for i, col in enumerate(self.df.columns)]
         
         # Get date columns
-        date_columns = [col for col in self.df.columns[3:] if '-' in str(col)]
+        date_columns = [col for col in self.df.columns[3:] if '-' in col]
         print(f"   Found {len(date_columns)} date columns")
         
-        # Extract data into dictionary
-        data_dict = {}
-        
-        for idx, row in self.df.iterrows():
-            if pd.notna(row.iloc[0]):
-                metric_name = str(row.iloc[0]).strip()
-                
-                # Handle subcategory
-                if len(row) > 1 and pd.notna(row.iloc[1]):
-                    subcategory = str(row.iloc[1]).strip()
-                    if subcategory.lower() not in ['nan', '', 'none']:
-                        key = f"{metric_name}_{subcategory}"
-                    else:
-                        key = metric_name
-                else:
-                    key = metric_name
-                
-                # Clean key
-                key = key.replace(' ', '_').replace('(', '').replace(')', '')
-                
-                # Extract values
-                values = []
-                for date_col in date_columns:
-                    if date_col in self.df.columns:
-                        val = row[date_col]
-                        if pd.notna(val):
-                            if isinstance(val, str):
-                                # Clean number format
-                                val = val.replace(',', '').replace(' ', '')
-                                if '.' in val and val.count('.') > 1:
-                                    val = val.replace('.', '')
-                            try:
-                                values.append(float(val))
-                            except:
-                                values.append(0)
-                        else:
-                            values.append(0)
-                
-                if values and not all(v == 0 for v in values):
-                    data_dict[key] = values
-        
+        # Keep only rows that name a metric
+        rows = self.df[self.df.iloc[:, 0].notna()]
+
+        # Build keys: "Metric_Subcategory" (or just "Metric")
+        metric = rows.iloc[:, 0].astype(str).str.strip()
+        sub = rows.iloc[:, 1].astype(str).str.strip()
+        no_sub = rows.iloc[:, 1].isna() | sub.str.lower().isin(['nan', '', 'none'])
+        keys = metric.where(no_sub, metric + '_' + sub)
+        keys = keys.str.replace(' ', '_', regex=False).str.replace(r'[()]', '', regex=True)
+
+        # Extract values as one numeric block (missing/invalid -> 0), cleaning all cells in one pass
+        cells = rows[date_columns].to_numpy()
+        values = self._to_numeric(pd.Series(cells.ravel())).fillna(0).to_numpy(dtype=float).reshape(cells.shape)
+
+        # Drop metrics that are all zero; a repeated key keeps its first position but the last values
+        mask = values.any(axis=1)
+        keys = keys[mask]
+        keep = ~keys.duplicated(keep='last').to_numpy()
+
         # Create clean dataframe
-        self.clean_df = pd.DataFrame(data_dict)
-        
-        # Parse dates
-        parsed_dates = self._parse_dates(date_columns[:len(self.clean_df)])
-        self.clean_df['Date'] = parsed_dates
+        self.clean_df = pd.DataFrame(values[mask][keep].T, columns=keys[keep].to_list())
+        self.clean_df = self.clean_df[list(pd.unique(keys))]
         
-        # Convert to datetime
-        self.clean_df['Date'] = pd.to_datetime(self.clean_df['Date'], errors='coerce')
-        self.clean_df = self.clean_df.dropna(subset=['Date'])
-        self.clean_df = self.clean_df.set_index('Date').sort_index()
+        # Parse dates straight into the index
+        self.clean_df.index = self._parse_dates(date_columns[:len(self.clean_df)])
+        self.clean_df = self.clean_df[self.clean_df.index.notna()].sort_index()
+        self._prepare_chart_data()
         
         print(f"   Processed {len(self.clean_df)} periods with {len(self.clean_df.columns)} metrics")
         if len(self.clean_df) > 0:
             print(f"   Date range: {self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}")
         
+    def _prepare_chart_data(self):
+        """Precompute values shared by the chart methods"""
+        # Plotting only needs single precision; clean_df keeps float64 for export
+        self.chart_df = self.clean_df.astype('float32')
+        
+        # Plain arrays for the plot calls, extracted once rather than per call
+        self.dates = self.chart_df.index.to_numpy()
+        self.arrays = {col: self.chart_df[col].to_numpy() for col in self.chart_df.columns}
+        
+        # Material totals
+        self.totals = {
+            'ore': self.chart_df.filter(like='Ore_Mined').sum(axis=1).to_numpy(),
+            'overburden': self.chart_df.filter(like='Overburden').sum(axis=1).to_numpy(),
+        }
+        self.totals['material'] = self.chart_df.filter(regex='Ore_Mined|Overburden').sum(axis=1).to_numpy()
+        
+        # Metrics available for charting
+        self.have = frozenset(self.chart_df.columns)
+        
+        # Month labels shared by the categorical (bar) charts
+        self.tick_labels = self.chart_df.index.strftime('%b-%y').tolist()
+        
+    def __getstate__(self):
+        """Chart workers only receive the float32 chart data"""
+        state = self.__dict__.copy()
+        state['df'] = state['clean_df'] = None
+        return state
+        
+    @staticmethod
+    def _to_numeric(col):
+        """Convert a column to float, cleaning text number formats"""
+        if pd.api.types.is_numeric_dtype(col):
+            return col.astype(float)
+        text = col.astype(str).str.replace(r'[, ]', '', regex=True)
+        # Multiple dots are thousands separators
+        text = text.where(text.str.count(r'\.') <= 1, text.str.replace('.', '', regex=False))
+        return pd.to_numeric(text, errors='coerce')
+
+    @staticmethod
+    def _ratio(num, den):
+        """Divide two series, NaN where the denominator is not positive"""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.full(len(den), np.nan), where=den > 0)
+
     def _parse_dates(self, date_strings):
         """Parse Spanish/English month abbreviations"""
         months = {
@@ -183,200 +317,185 @@ class MiningDataProcessor:
             'dic': '12', 'dec': '12', 'diciembre': '12'
         }
         
-        parsed = []
-        for date_str in date_strings:
-            try:
-                parts = str(date_str).lower().split('-')
-                if len(parts) >= 2:
-                    month = months.get(parts[0], '01')
-                    year = parts[1]
-                    if len(year) == 2:
-                        year = '20' + year
-                    parsed.append(f"{year}-{month}-01")
-                else:
-                    parsed.append(None)
-            except:
-                parsed.append(None)
-        return parsed
+        parts = pd.Series(date_strings, dtype=str).str.lower().str.split('-', expand=True)
+        if parts.shape[1] < 2:
+            return pd.DatetimeIndex([pd.NaT] * len(parts), name='Date')
+        
+        month = parts[0].map(months).fillna('01')
+        year = parts[1].where(parts[1].str.len() != 2, '20' + parts[1])
+        parsed = pd.to_datetime(year + '-' + month + '-01', format='%Y-%m-%d', errors='coerce')
+        return pd.DatetimeIndex(parsed, name='Date')
     
     def create_charts(self):
-        """Generate all charts"""
-        self.chart_files = []
-        
-        print("   Creating Production Overview...")
-        self._create_production_charts()
-        
-        print("   Creating Efficiency Analysis...")
-        self._create_efficiency_charts()
+        """Generate all charts, rendering each figure in its own process"""
+        chart_makers = [
+            ('Production Overview', self._create_production_charts),
+            ('Efficiency Analysis', self._create_efficiency_charts),
+            ('Comparative Analysis', self._create_comparative_charts),
+            ('Trend Analysis', self._create_trend_charts),
+        ]
         
-        print("   Creating Comparative Analysis...")
-        self._create_comparative_charts()
+        with ProcessPoolExecutor(max_workers=len(chart_makers)) as executor:
+            futures = []
+            for name, maker in chart_makers:
+                print(f"   Creating {name}...")
+                futures.append(executor.submit(maker))
+            results = [future.result() for future in futures]
         
-        print("   Creating Trend Analysis...")
-        self._create_trend_charts()
+        # Figures with no data to show are skipped
+        self.chart_images = [result for result in results if result]
         
     def _create_production_charts(self):
         """Create production charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not any('Ore_Mined' in col or 'Overburden' in col for col in self.have):
+            return None
+        
+        fig, axes = _chart_grid()
+        df, cols = self.chart_df, self.arrays
+        dates = self.dates
         fig.suptitle('Production Overview', fontsize=16, fontweight='bold')
         
         # Chart 1: Ore Production
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], 
+        if 'Ore_Mined_RGM' in self.have:
+            ax1.plot(dates, cols['Ore_Mined_RGM'], 
                     marker='o', label='RGM', linewidth=2, markersize=4, color='#3498db')
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_Sar'], 
+        if 'Ore_Mined_Sar' in self.have:
+            ax1.plot(dates, cols['Ore_Mined_Sar'], 
                     marker='s', label='Sar', linewidth=2, markersize=4, color='#e74c3c')
         ax1.set_title('Ore Production Over Time')
         ax1.set_xlabel('Date')
         ax1.set_ylabel('Ore Mined (kt)')
         ax1.legend()
         ax1.grid(True, alpha=0.3)
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+        ax1.tick_params(axis='x', labelrotation=45)
         
         # Chart 2: Overburden
         ax2 = axes[0, 1]
-        if 'Overburden_RGM' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_RGM'], 
+        if 'Overburden_RGM' in self.have:
+            ax2.plot(dates, cols['Overburden_RGM'], 
                     marker='o', label='RGM', linewidth=2, markersize=4, color='#9b59b6')
-        if 'Overburden_Sar' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_Sar'], 
+        if 'Overburden_Sar' in self.have:
+            ax2.plot(dates, cols['Overburden_Sar'], 
                     marker='s', label='Sar', linewidth=2, markersize=4, color='#f39c12')
         ax2.set_title('Overburden Movement')
         ax2.set_xlabel('Date')
         ax2.set_ylabel('Overburden (kt)')
         ax2.legend()
         ax2.grid(True, alpha=0.3)
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+        ax2.tick_params(axis='x', labelrotation=45)
         
         # Chart 3: Total Material
         ax3 = axes[1, 0]
-        total_ore = pd.Series(0, index=self.clean_df.index)
-        total_overburden = pd.Series(0, index=self.clean_df.index)
-        
-        for col in self.clean_df.columns:
-            if 'Ore_Mined' in col:
-                total_ore += self.clean_df[col]
-            elif 'Overburden' in col:
-                total_overburden += self.clean_df[col]
-        
-        ax3.bar(self.clean_df.index, total_ore, label='Total Ore', alpha=0.7, color='#3498db')
-        ax3.bar(self.clean_df.index, total_overburden, bottom=total_ore, 
-               label='Total Overburden', alpha=0.7, color='#e67e22')
+        material = np.column_stack([self.totals['ore'], self.totals['overburden']])
+        
+        ax3.stackplot(dates, material.T, labels=['Total Ore', 'Total Overburden'],
+                     colors=['#3498db', '#e67e22'], alpha=0.7)
         ax3.set_title('Total Material Movement')
         ax3.set_xlabel('Date')
         ax3.set_ylabel('Material (kt)')
         ax3.legend()
         ax3.grid(True, alpha=0.3, axis='y')
-        plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
+        ax3.tick_params(axis='x', labelrotation=45)
         
         # Chart 4: Strip Ratio
         ax4 = axes[1, 1]
-        if 'Overburden_RGM' in self.clean_df.columns and 'Ore_Mined_RGM' in self.clean_df.columns:
-            strip_rgm = self.clean_df['Overburden_RGM'] / (self.clean_df['Ore_Mined_RGM'] + 0.001)
-            strip_rgm = strip_rgm.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, strip_rgm, marker='o', label='RGM', linewidth=2, markersize=4)
-        if 'Overburden_Sar' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            strip_sar = self.clean_df['Overburden_Sar'] / (self.clean_df['Ore_Mined_Sar'] + 0.001)
-            strip_sar = strip_sar.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, strip_sar, marker='s', label='Sar', linewidth=2, markersize=4)
+        if 'Overburden_RGM' in self.have and 'Ore_Mined_RGM' in self.have:
+            strip_rgm = self._ratio(cols['Overburden_RGM'], cols['Ore_Mined_RGM'])
+            ax4.plot(dates, strip_rgm, marker='o', label='RGM', linewidth=2, markersize=4)
+        if 'Overburden_Sar' in self.have and 'Ore_Mined_Sar' in self.have:
+            strip_sar = self._ratio(cols['Overburden_Sar'], cols['Ore_Mined_Sar'])
+            ax4.plot(dates, strip_sar, marker='s', label='Sar', linewidth=2, markersize=4)
         ax4.set_title('Stripping Ratio Trends')
         ax4.set_xlabel('Date')
         ax4.set_ylabel('Strip Ratio')
         ax4.legend()
         ax4.grid(True, alpha=0.3)
-        plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
+        ax4.tick_params(axis='x', labelrotation=45)
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'production.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        self.chart_files.append(('Production Overview', filename))
+        fig.subplots_adjust(**CHART_MARGINS)
+        return ('Production Overview', _chart_bytes(fig))
         
     def _create_efficiency_charts(self):
         """Create efficiency charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not {'Active_Fleet_Count_Aprox', 'Liter_of_Diesel_Consumed'} & self.have:
+            return None
+        
+        fig, axes = _chart_grid()
+        df, cols = self.chart_df, self.arrays
+        dates = self.dates
         fig.suptitle('Efficiency Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Fleet vs Production
         ax1 = axes[0, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns:
-            total_prod = pd.Series(0, index=self.clean_df.index)
-            for col in self.clean_df.columns:
-                if 'Ore_Mined' in col:
-                    total_prod += self.clean_df[col]
+        if 'Active_Fleet_Count_Aprox' in self.have:
+            total_prod = self.totals['ore']
             
             ax1_twin = ax1.twinx()
-            ax1.bar(self.clean_df.index, total_prod, alpha=0.5, color='skyblue', label='Production')
-            ax1_twin.plot(self.clean_df.index, self.clean_df['Active_Fleet_Count_Aprox'], 
+            ax1.bar(dates, total_prod, alpha=0.5, color='skyblue', label='Production')
+            ax1_twin.plot(dates, cols['Active_Fleet_Count_Aprox'], 
                          color='red', marker='o', linewidth=2, markersize=4, label='Fleet')
             ax1.set_xlabel('Date')
             ax1.set_ylabel('Production (kt)', color='blue')
             ax1_twin.set_ylabel('Fleet Count', color='red')
             ax1.set_title('Fleet vs Production')
             ax1.grid(True, alpha=0.3)
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+            ax1.tick_params(axis='x', labelrotation=45)
         
         # Chart 2: Diesel Consumption
         ax2 = axes[0, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            diesel = self.clean_df['Liter_of_Diesel_Consumed'] / 1000000
-            ax2.plot(self.clean_df.index, diesel, marker='o', color='green', linewidth=2, markersize=4)
-            ax2.fill_between(self.clean_df.index, diesel, alpha=0.3, color='green')
+        if 'Liter_of_Diesel_Consumed' in self.have:
+            diesel = cols['Liter_of_Diesel_Consumed'] / 1000000
+            ax2.plot(dates, diesel, marker='o', color='green', linewidth=2, markersize=4)
+            ax2.fill_between(dates, diesel, alpha=0.3, color='green')
             ax2.set_title('Diesel Consumption')
             ax2.set_xlabel('Date')
             ax2.set_ylabel('Diesel (Million L)')
             ax2.grid(True, alpha=0.3)
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+            ax2.tick_params(axis='x', labelrotation=45)
         
         # Chart 3: Productivity
         ax3 = axes[1, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns:
-            total_mat = pd.Series(0, index=self.clean_df.index)
-            for col in self.clean_df.columns:
-                if 'Ore_Mined' in col or 'Overburden' in col:
-                    total_mat += self.clean_df[col]
-            productivity = total_mat / (self.clean_df['Active_Fleet_Count_Aprox'] + 0.001)
-            ax3.plot(self.clean_df.index, productivity, marker='o', color='purple', linewidth=2, markersize=4)
+        if 'Active_Fleet_Count_Aprox' in self.have:
+            total_mat = self.totals['material']
+            productivity = self._ratio(total_mat, cols['Active_Fleet_Count_Aprox'])
+            ax3.plot(dates, productivity, marker='o', color='purple', linewidth=2, markersize=4)
             ax3.set_title('Productivity per Fleet Unit')
             ax3.set_xlabel('Date')
             ax3.set_ylabel('kt per Unit')
             ax3.grid(True, alpha=0.3)
-            plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
+            ax3.tick_params(axis='x', labelrotation=45)
         
         # Chart 4: Fuel Efficiency
         ax4 = axes[1, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            total_mat = pd.Series(0, index=self.clean_df.index)
-            for col in self.clean_df.columns:
-                if 'Ore_Mined' in col or 'Overburden' in col:
-                    total_mat += self.clean_df[col]
-            fuel_eff = self.clean_df['Liter_of_Diesel_Consumed'] / (total_mat + 0.001)
-            fuel_eff = fuel_eff.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, fuel_eff, marker='o', color='orange', linewidth=2, markersize=4)
+        if 'Liter_of_Diesel_Consumed' in self.have:
+            total_mat = self.totals['material']
+            fuel_eff = self._ratio(cols['Liter_of_Diesel_Consumed'], total_mat)
+            ax4.plot(dates, fuel_eff, marker='o', color='orange', linewidth=2, markersize=4)
             ax4.set_title('Fuel Efficiency')
             ax4.set_xlabel('Date')
             ax4.set_ylabel('L/kt')
             ax4.grid(True, alpha=0.3)
-            plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
+            ax4.tick_params(axis='x', labelrotation=45)
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'efficiency.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        self.chart_files.append(('Efficiency Analysis', filename))
+        fig.subplots_adjust(**CHART_MARGINS)
+        return ('Efficiency Analysis', _chart_bytes(fig))
         
     def _create_comparative_charts(self):
         """Create comparative charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not ({'Ore_Mined_RGM', 'Ore_Mined_Sar'} <= self.have
+                or {'Overburden_RGM', 'Overburden_Sar'} <= self.have):
+            return None
+        
+        fig, axes = _chart_grid()
+        df, cols = self.chart_df, self.arrays
         fig.suptitle('Comparative Analysis: RGM vs Sar', fontsize=16, fontweight='bold')
         
         # Chart 1: Production Pie
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            rgm = self.clean_df['Ore_Mined_RGM'].sum()
-            sar = self.clean_df['Ore_Mined_Sar'].sum()
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
+            rgm = df['Ore_Mined_RGM'].sum()
+            sar = df['Ore_Mined_Sar'].sum()
             if rgm > 0 or sar > 0:
                 ax1.pie([rgm, sar], labels=['RGM', 'Sar'], autopct='%1.1f%%', 
                        colors=['#3498db', '#e74c3c'])
@@ -384,25 +503,27 @@ class MiningDataProcessor:
         
         # Chart 2: Monthly Comparison
         ax2 = axes[0, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            sample = self.clean_df.iloc[::3] if len(self.clean_df) > 15 else self.clean_df
-            x = np.arange(len(sample))
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
+            step = 3 if len(df) > 15 else 1
+            rgm_sample = cols['Ore_Mined_RGM'][::step]
+            sar_sample = cols['Ore_Mined_Sar'][::step]
+            x = np.arange(len(rgm_sample))
             width = 0.35
-            ax2.bar(x - width/2, sample['Ore_Mined_RGM'], width, label='RGM', color='#3498db')
-            ax2.bar(x + width/2, sample['Ore_Mined_Sar'], width, label='Sar', color='#e74c3c')
+            ax2.bar(x - width/2, rgm_sample, width, label='RGM', color='#3498db')
+            ax2.bar(x + width/2, sar_sample, width, label='Sar', color='#e74c3c')
             ax2.set_xlabel('Date')
             ax2.set_ylabel('Ore (kt)')
             ax2.set_title('Monthly Comparison')
             ax2.set_xticks(x)
-            ax2.set_xticklabels([d.strftime('%b-%y') for d in sample.index], rotation=45, ha='right')
+            ax2.set_xticklabels(self.tick_labels[::step], rotation=45, ha='right')
             ax2.legend()
             ax2.grid(True, alpha=0.3, axis='y')
         
         # Chart 3: Overburden Pie
         ax3 = axes[1, 0]
-        if 'Overburden_RGM' in self.clean_df.columns and 'Overburden_Sar' in self.clean_df.columns:
-            rgm_ob = self.clean_df['Overburden_RGM'].sum()
-            sar_ob = self.clean_df['Overburden_Sar'].sum()
+        if 'Overburden_RGM' in self.have and 'Overburden_Sar' in self.have:
+            rgm_ob = df['Overburden_RGM'].sum()
+            sar_ob = df['Overburden_Sar'].sum()
             if rgm_ob > 0 or sar_ob > 0:
                 ax3.pie([rgm_ob, sar_ob], labels=['RGM', 'Sar'], autopct='%1.1f%%',
                        colors=['#9b59b6', '#f39c12'])
@@ -410,17 +531,17 @@ class MiningDataProcessor:
         
         # Chart 4: Metrics
         ax4 = axes[1, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
             metrics = ['Avg\n(kt/mo)', 'Max\n(kt)', 'Total\n(kt/1000)']
             rgm_vals = [
-                self.clean_df['Ore_Mined_RGM'].mean(),
-                self.clean_df['Ore_Mined_RGM'].max(),
-                self.clean_df['Ore_Mined_RGM'].sum()/1000
+                df['Ore_Mined_RGM'].mean(),
+                df['Ore_Mined_RGM'].max(),
+                df['Ore_Mined_RGM'].sum()/1000
             ]
             sar_vals = [
-                self.clean_df['Ore_Mined_Sar'].mean(),
-                self.clean_df['Ore_Mined_Sar'].max(),
-                self.clean_df['Ore_Mined_Sar'].sum()/1000
+                df['Ore_Mined_Sar'].mean(),
+                df['Ore_Mined_Sar'].max(),
+                df['Ore_Mined_Sar'].sum()/1000
             ]
             x = np.arange(len(metrics))
             width = 0.35
@@ -433,47 +554,46 @@ class MiningDataProcessor:
             ax4.legend()
             ax4.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'comparative.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        self.chart_files.append(('Comparative Analysis', filename))
+        fig.subplots_adjust(**CHART_MARGINS)
+        return ('Comparative Analysis', _chart_bytes(fig))
         
     def _create_trend_charts(self):
         """Create trend charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not ({'Ore_Mined_RGM', 'Ore_Mined_Sar'} & self.have
+                or {'Active_Fleet_Count_Aprox', 'Liter_of_Diesel_Consumed'} <= self.have):
+            return None
+        
+        fig, axes = _chart_grid()
+        df, cols = self.chart_df, self.arrays
+        dates = self.dates
         fig.suptitle('Trend Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Moving Averages
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            ma3 = self.clean_df['Ore_Mined_RGM'].rolling(window=3, center=True).mean()
-            ma6 = self.clean_df['Ore_Mined_RGM'].rolling(window=6, center=True).mean()
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], alpha=0.3, label='Actual', color='gray')
-            ax1.plot(self.clean_df.index, ma3, label='3-Month MA', linewidth=2, color='red')
-            ax1.plot(self.clean_df.index, ma6, label='6-Month MA', linewidth=2, color='green')
+        if 'Ore_Mined_RGM' in self.have:
+            ma3 = df['Ore_Mined_RGM'].rolling(window=3, center=True).mean().to_numpy()
+            ma6 = df['Ore_Mined_RGM'].rolling(window=6, center=True).mean().to_numpy()
+            ax1.plot(dates, cols['Ore_Mined_RGM'], alpha=0.3, label='Actual', color='gray')
+            ax1.plot(dates, ma3, label='3-Month MA', linewidth=2, color='red')
+            ax1.plot(dates, ma6, label='6-Month MA', linewidth=2, color='green')
             ax1.set_title('Moving Averages - RGM')
             ax1.set_xlabel('Date')
             ax1.set_ylabel('Ore (kt)')
             ax1.legend()
             ax1.grid(True, alpha=0.3)
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+            ax1.tick_params(axis='x', labelrotation=45)
         
         # Chart 2: Yearly
         ax2 = axes[0, 1]
-        yearly = {}
-        for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar']:
-            if col in self.clean_df.columns:
-                yr = self.clean_df[col].groupby(self.clean_df.index.year).sum()
-                for y, v in yr.items():
-                    if y not in yearly:
-                        yearly[y] = {}
-                    yearly[y][col] = v
-        
-        if yearly:
-            years = sorted(yearly.keys())
-            rgm_y = [yearly[y].get('Ore_Mined_RGM', 0) for y in years]
-            sar_y = [yearly[y].get('Ore_Mined_Sar', 0) for y in years]
+        ore_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar']
+        present = [col for col in ore_cols if col in self.have]
+        
+        if present:
+            yearly = df[present].groupby(df.index.year).sum()
+            yearly = yearly.reindex(columns=ore_cols, fill_value=0)
+            years = yearly.index.tolist()
+            rgm_y = yearly['Ore_Mined_RGM'].to_numpy()
+            sar_y = yearly['Ore_Mined_Sar'].to_numpy()
             x = np.arange(len(years))
             width = 0.35
             ax2.bar(x - width/2, rgm_y, width, label='RGM', color='#3498db')
@@ -488,15 +608,21 @@ class MiningDataProcessor:
         
         # Chart 3: Correlation
         ax3 = axes[1, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns and 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            fleet = self.clean_df['Active_Fleet_Count_Aprox']
-            diesel = self.clean_df['Liter_of_Diesel_Consumed'] / 1000000
+        if 'Active_Fleet_Count_Aprox' in self.have and 'Liter_of_Diesel_Consumed' in self.have:
+            fleet = cols['Active_Fleet_Count_Aprox']
+            diesel = cols['Liter_of_Diesel_Consumed'] / 1000000
             mask = (fleet > 0) & (diesel > 0)
-            if mask.sum() > 0:
-                ax3.scatter(fleet[mask], diesel[mask], alpha=0.6, s=50)
-                z = np.polyfit(fleet[mask], diesel[mask], 1)
-                p = np.poly1d(z)
-                ax3.plot(sorted(fleet[mask]), p(sorted(fleet[mask])), "r--", alpha=0.8)
+            if mask.any():
+                x = fleet[mask].astype(float)
+                y = diesel[mask].astype(float)
+                ax3.scatter(x, y, alpha=0.6, s=50)
+                # Least-squares line in closed form (same fit as polyfit degree 1)
+                dx = x - x.mean()
+                var = (dx * dx).sum()
+                slope = (dx * (y - y.mean())).sum() / var if var > 0 else 0.0
+                intercept = y.mean() - slope * x.mean()
+                xs = np.sort(x)
+                ax3.plot(xs, slope * xs + intercept, "r--", alpha=0.8)
                 ax3.set_xlabel('Fleet Count')
                 ax3.set_ylabel('Diesel (Million L)')
                 ax3.set_title('Fleet vs Diesel')
@@ -504,10 +630,11 @@ class MiningDataProcessor:
         
         # Chart 4: Seasonality
         ax4 = axes[1, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            monthly = self.clean_df['Ore_Mined_RGM'].groupby(self.clean_df.index.month).mean()
+        if 'Ore_Mined_RGM' in self.have:
+            monthly = df['Ore_Mined_RGM'].groupby(df.index.month).mean()
+            monthly_avg = monthly.reindex(range(1, 13), fill_value=0).to_numpy()
             months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            ax4.bar(range(1, 13), monthly.reindex(range(1, 13), fill_value=0), color='steelblue', alpha=0.7)
+            ax4.bar(range(1, 13), monthly_avg, color='steelblue', alpha=0.7)
             avg = monthly.mean()
             ax4.axhline(y=avg, color='red', linestyle='--', label=f'Avg: {avg:.1f}')
             ax4.set_xlabel('Month')
@@ -518,11 +645,8 @@ class MiningDataProcessor:
             ax4.legend()
             ax4.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'trends.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        self.chart_files.append(('Trend Analysis', filename))
+        fig.subplots_adjust(**CHART_MARGINS)
+        return ('Trend Analysis', _chart_bytes(fig))
         
     def create_excel_with_charts(self):
         """Create Excel file with embedded charts"""
@@ -532,83 +656,85 @@ class MiningDataProcessor:
         elif not self.output_file.endswith('.xlsx'):
             self.output_file += '.xlsx'
         
-        # Create workbook
-        wb = Workbook()
-        
-        # Summary sheet
-        ws_summary = wb.active
-        ws_summary.title = "Summary"
-        self._add_summary(ws_summary)
-        
-        # Data sheet
-        ws_data = wb.create_sheet("Data")
-        for r in dataframe_to_rows(self.clean_df.reset_index(), index=False, header=True):
-            ws_data.append(r)
-        self._format_sheet(ws_data)
-        
-        # Chart sheets
-        for name, file in self.chart_files:
-            ws = wb.create_sheet(title=name)
-            ws['A1'] = name
-            ws['A1'].font = Font(size=16, bold=True)
-            img = OpenpyxlImage(file)
-            img.width = 1100
-            img.height = 750
-            ws.add_image(img, 'A3')
-        
-        # Save
-        wb.save(self.output_file)
+        # Stream rows straight to disk; each sheet is written top to bottom
+        with pd.ExcelWriter(self.output_file, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
+            workbook = writer.book
+            
+            # Summary sheet
+            self._add_summary(workbook, workbook.add_worksheet("Summary"))
+            
+            # Data sheet
+            self._add_data(workbook, workbook.add_worksheet("Data"))
+            
+            # Chart sheets
+            title_format = workbook.add_format({'font_size': 16, 'bold': True})
+            for name, image in self.chart_images:
+                ws = workbook.add_worksheet(name)
+                ws.write('A1', name, title_format)
+                ws.insert_image('A3', f'{name}.jpg', {'image_data': io.BytesIO(image), **CHART_IMAGE_SCALE})
+        
         return self.output_file
         
-    def _add_summary(self, ws):
+    def _add_summary(self, workbook, ws):
         """Add summary statistics"""
-        data = [
-            ['Mining Data Analysis Summary'],
-            [''],
-            ['Period', f"{self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}"],
-            ['Months', str(len(self.clean_df))],
-            [''],
-            ['Metric', 'RGM', 'Sar'],
-        ]
+        # Numbers stay numeric; Excel applies the display format
+        total_format = workbook.add_format({'num_format': '#,##0'})
+        avg_format = workbook.add_format({'num_format': '#,##0.0'})
         
         # Add metrics
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have:
             rgm_total = self.clean_df['Ore_Mined_RGM'].sum()
             rgm_avg = self.clean_df['Ore_Mined_RGM'].mean()
         else:
             rgm_total = rgm_avg = 0
             
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_Sar' in self.have:
             sar_total = self.clean_df['Ore_Mined_Sar'].sum()
             sar_avg = self.clean_df['Ore_Mined_Sar'].mean()
         else:
             sar_total = sar_avg = 0
         
-        data.append(['Total Ore (kt)', f'{rgm_total:,.0f}', f'{sar_total:,.0f}'])
-        data.append(['Avg Ore/Month', f'{rgm_avg:,.1f}', f'{sar_avg:,.1f}'])
-        
-        for row in data:
-            ws.append(row)
+        # (label, values, value format)
+        data = [
+            ('', [], None),
+            ('Period', [f"{self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}"], None),
+            ('Months', [len(self.clean_df)], None),
+            ('', [], None),
+            ('Metric', ['RGM', 'Sar'], None),
+            ('Total Ore (kt)', [rgm_total, sar_total], total_format),
+            ('Avg Ore/Month', [rgm_avg, sar_avg], avg_format),
+        ]
         
         # Format
-        ws['A1'].font = Font(size=14, bold=True)
-        ws.merge_cells('A1:C1')
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        
-    def _format_sheet(self, ws):
-        """Format worksheet"""
-        for cell in ws[1]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill("solid", fgColor="366092")
-            cell.alignment = Alignment(horizontal="center")
+        ws.merge_range('A1:C1', 'Mining Data Analysis Summary',
+                       workbook.add_format({'font_size': 14, 'bold': True}))
+        ws.set_column('A:A', 20)
+        ws.set_column('B:C', 15)
+        
+        for row_num, (label, values, value_format) in enumerate(data, start=1):
+            ws.write(row_num, 0, label)
+            ws.write_row(row_num, 1, values, value_format)
+        
+    def _add_data(self, workbook, ws):
+        """Write the clean data with a formatted header row"""
+        header_format = workbook.add_format({
+            'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092', 'align': 'center'
+        })
+        date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        
+        ws.write_row(0, 0, ['Date'] + list(self.clean_df.columns), header_format)
+        dates = self.clean_df.index.to_pydatetime()
+        for row_num, (date, values) in enumerate(zip(dates, self.clean_df.to_numpy().tolist()), start=1):
+            ws.write_datetime(row_num, 0, date, date_format)
+            ws.write_row(row_num, 1, values)
 
 
 class MiningAnalyzerGUI:
     """GUI interface for the mining analyzer"""
     
     def __init__(self):
+        _load_gui()
         self.root = tk.Tk()
         self.root.title("Mining Data Analyzer")
         self.root.geometry("600x550")
@@ -7,7 +7,6 @@ import matplotlib.dates as mdates
 from openpyxl import Workbook
 from openpyxl.drawing.image import Image
 from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
 import os
 import threading
 from datetime import datetime
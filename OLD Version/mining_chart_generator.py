@@ -1,46 +1,103 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.dates as mdates
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from openpyxl import load_workbook, Workbook
 from openpyxl.drawing.image import Image
 from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from PIL import Image as PILImage
+import io
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import warnings
-warnings.filterwarnings('ignore')
 
-# Set matplotlib style
-plt.style.use('seaborn-v0_8-darkgrid')
+# Prefer the calamine reader when installed; otherwise pandas' default
+# (openpyxl, already opened read-only by pandas)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Render off-screen with Agg and set the chart style
+matplotlib.use('Agg')
+matplotlib.style.use('seaborn-v0_8-darkgrid')
+
+# Fixed margins for the 2x2 chart grids (avoids a tight_layout pass per chart)
+CHART_MARGINS = dict(left=0.06, right=0.95, top=0.92, bottom=0.09, hspace=0.45, wspace=0.25)
+
+# 15x10in at 75 dpi renders 1125x750, close to the 1100x750 size the sheets embed at.
+# Lighter zlib level for chart PNGs; the xlsx zip recompresses them anyway
+CHART_DPI = 75
+PNG_SAVE = dict(compress_level=3, optimize=False)
+
+# Shared cell styles (one instance each, so openpyxl stores one style record)
+HEADER_FONT = Font(bold=True, color="FFFFFFFF")
+HEADER_FILL = PatternFill("solid", fgColor="FF366092")
+HEADER_ALIGN = Alignment(horizontal="center")
+SUMMARY_TITLE_FONT = Font(size=14, bold=True, color="FFFFFFFF")
+CHART_TITLE_FONT = Font(size=16, bold=True)
+BOLD_FONT = Font(bold=True)
+
+_chart_fig = None
 
 class MiningDataChartGenerator:
+    # Spanish/English month names to month numbers
+    MONTHS = {
+        'ene': '01', 'jan': '01', 'enero': '01',
+        'feb': '02', 'febrero': '02',
+        'mar': '03', 'marzo': '03',
+        'abr': '04', 'apr': '04', 'abril': '04',
+        'may': '05', 'mayo': '05',
+        'jun': '06', 'junio': '06',
+        'jul': '07', 'julio': '07',
+        'ago': '08', 'aug': '08', 'agosto': '08',
+        'sep': '09', 'sept': '09', 'septiembre': '09',
+        'oct': '10', 'octubre': '10',
+        'nov': '11', 'noviembre': '11',
+        'dic': '12', 'dec': '12', 'diciembre': '12'
+    }
+
+    # Shared tick formatter; keeps no per-axis state for a fixed format string
+    DATE_FORMATTER = mdates.DateFormatter('%b-%y')
+    
     def __init__(self, input_file, sheet_name=None):
         """Initialize the chart generator"""
         self.input_file = input_file
         self.sheet_name = sheet_name
         self.df = None
         self.clean_df = None
-        self.temp_dir = "temp_charts"
+        self.have = frozenset()
+        self.markevery = 1
+        self.dates = None
+        self.tick_labels = []
+        self.total_ore = None
+        self.total_overburden = None
+        self.total_material = None
         
-        # Create temp directory for charts
-        if not os.path.exists(self.temp_dir):
-            os.makedirs(self.temp_dir)
-            
     def load_data(self):
         """Load Excel data"""
         print(f"📂 Loading file: {self.input_file}")
         
-        if self.sheet_name:
-            self.df = pd.read_excel(self.input_file, sheet_name=self.sheet_name)
-        else:
-            # Get first sheet
-            excel_file = pd.ExcelFile(self.input_file)
-            sheet_names = excel_file.sheet_names
-            print(f"   Available sheets: {', '.join(sheet_names)}")
-            self.df = pd.read_excel(self.input_file, sheet_name=sheet_names[0])
-            print(f"   Using sheet: {sheet_names[0]}")
+        # Open the workbook once and parse the requested (or first) sheet from it;
+        # readers warn about unsupported workbook features (validation, styles)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            with pd.ExcelFile(self.input_file, engine=EXCEL_ENGINE) as excel_file:
+                if self.sheet_name:
+                    self.df = excel_file.parse(self.sheet_name)
+                else:
+                    sheet_names = excel_file.sheet_names
+                    print(f"   Available sheets: {', '.join(sheet_names)}")
+                    self.df = excel_file.parse(sheet_names[0])
+                    print(f"   Using sheet: {sheet_names[0]}")
             
         print(f"✅ Data loaded: {self.df.shape[0]} rows × {self.df.shape[1]} columns")
         
@@ -50,13 +107,10 @@ class MiningDataChartGenerator:
         
         try:
             # Find header row containing date columns
-            header_row = 0
-            for idx in range(min(10, len(self.df))):
-                row_values = self.df.iloc[idx].astype(str).values
-                if any('ene-' in val.lower() or 'feb-' in val.lower() or 'mar-' in val.lower() 
-                      for val in row_values):
-                    header_row = idx
-                    break
+            top = self.df.head(10).astype(str)
+            hits = top.apply(lambda col: col.str.contains('ene-|feb-|mar-', case=False, regex=True))
+            hits = hits.any(axis=1).to_numpy()
+            header_row = int(hits.argmax()) if hits.any() else 0
             
             # Set proper column names
             if header_row > 0:
@@ -67,66 +121,55 @@ class MiningDataChartGenerator:
             self.df.columns = [str(col).strip() if pd.notna(col) else f'Col_{i}' 
                               for i, col in enumerate(self.df.columns)]
             
-            print(f"   Found {len([c for c in self.df.columns if '-' in str(c)])} date columns")
-            
-            # Extract data into dictionary
-            data_dict = {}
-            date_columns = []
-            
-            for col in self.df.columns[3:]:  # Skip first 3 columns (metric info)
-                if '-' in str(col):
-                    date_columns.append(str(col))
-            
-            # Process each metric row
-            for idx, row in self.df.iterrows():
-                if pd.notna(row.iloc[0]):
-                    # Get metric name
-                    metric_name = str(row.iloc[0]).strip()
-                    
-                    # Get subcategory if exists
-                    if pd.notna(row.iloc[1]):
-                        subcategory = str(row.iloc[1]).strip()
-                        if subcategory.lower() not in ['nan', '']:
-                            key = f"{metric_name}_{subcategory}"
-                        else:
-                            key = metric_name
-                    else:
-                        key = metric_name
-                    
-                    # Clean key name
-                    key = key.replace(' ', '_').replace('(', '').replace(')', '')
-                    
-                    # Extract values
-                    values = []
-                    for date_col in date_columns:
-                        if date_col in self.df.columns:
-                            val = row[date_col]
-                            if pd.notna(val):
-                                # Clean numeric values
-                                if isinstance(val, str):
-                                    val = val.replace(',', '').replace('.', '')
-                                try:
-                                    values.append(float(val))
-                                except:
-                                    values.append(0)
-                            else:
-                                values.append(0)
-                    
-                    if values and not all(v == 0 for v in values):
-                        data_dict[key] = values
+            # Names are strings now; scan them once (skip the 3 metric info columns)
+            date_columns = [col for col in self.df.columns[3:] if '-' in col]
+            print(f"   Found {len(date_columns)} date columns")
+            
+            # Keep only rows that name a metric
+            rows = self.df[self.df.iloc[:, 0].notna()]
+            
+            # Build keys: "Metric_Subcategory" (or just "Metric")
+            metric = rows.iloc[:, 0].astype(str).str.strip()
+            sub = rows.iloc[:, 1].astype(str).str.strip()
+            no_sub = rows.iloc[:, 1].isna() | sub.str.lower().isin(['nan', ''])
+            keys = metric.where(no_sub, metric + '_' + sub)
+            keys = keys.str.replace(' ', '_', regex=False).str.replace(r'[()]', '', regex=True)
+            
+            # Convert the whole date block to numbers in one pass over its cells
+            cells = rows[date_columns].to_numpy()
+            values = self._to_numeric(pd.Series(cells.ravel())).fillna(0).to_numpy(dtype=float).reshape(cells.shape)
+            
+            # Drop all-zero metrics; a repeated key keeps its first position but the last values
+            nonzero = values.any(axis=1)
+            keys, values = keys[nonzero], values[nonzero]
+            last = ~keys.duplicated(keep='last').to_numpy()
             
             # Create clean dataframe
-            self.clean_df = pd.DataFrame(data_dict)
+            self.clean_df = pd.DataFrame(values[last].T, columns=keys[last].to_list())
+            self.clean_df = self.clean_df[list(pd.unique(keys))]
             
-            # Parse dates
-            parsed_dates = self._parse_dates(date_columns[:len(self.clean_df)])
-            self.clean_df['Date'] = parsed_dates
+            # Parse dates (invalid headers become NaT)
+            self.clean_df['Date'] = self._parse_dates(date_columns[:len(self.clean_df)])
             
             # Set date as index
-            self.clean_df['Date'] = pd.to_datetime(self.clean_df['Date'], errors='coerce')
             self.clean_df = self.clean_df.dropna(subset=['Date'])
             self.clean_df = self.clean_df.set_index('Date').sort_index()
             
+            # Metric names for quick membership checks in the chart methods
+            self.have = frozenset(self.clean_df.columns)
+            
+            # Long histories get every n-th marker only (about 40 per line)
+            self.markevery = max(1, len(self.clean_df) // 40)
+            
+            # Dates as matplotlib day numbers, converted once for every chart
+            self.dates = mdates.date2num(self.clean_df.index)
+            
+            # Month labels shared by the categorical (bar) charts
+            self.tick_labels = self.clean_df.index.strftime('%b-%y').tolist()
+            
+            # Row-wise totals shared by several charts, computed once
+            self._compute_totals()
+            
             print(f"✅ Processed {len(self.clean_df)} time periods with {len(self.clean_df.columns)} metrics")
             print(f"   Date range: {self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}")
             print(f"   Metrics found: {', '.join(list(self.clean_df.columns)[:5])}...")
@@ -135,87 +178,136 @@ class MiningDataChartGenerator:
             print(f"❌ Error processing data: {str(e)}")
             raise
             
+    @staticmethod
+    def _to_numeric(col):
+        """Convert a column to float; text cells drop ',' and '.' separators"""
+        numbers = pd.to_numeric(col, errors='coerce')
+        if pd.api.types.infer_dtype(col, skipna=True) in ('string', 'mixed', 'mixed-integer'):
+            text = pd.to_numeric(col.str.replace(r'[,.]', '', regex=True), errors='coerce')
+            numbers = text.fillna(numbers)
+        return numbers
+        
     def _parse_dates(self, date_strings):
         """Parse Spanish month abbreviations to dates"""
-        months = {
-            'ene': '01', 'jan': '01', 'enero': '01',
-            'feb': '02', 'febrero': '02',
-            'mar': '03', 'marzo': '03',
-            'abr': '04', 'apr': '04', 'abril': '04',
-            'may': '05', 'mayo': '05',
-            'jun': '06', 'junio': '06',
-            'jul': '07', 'julio': '07',
-            'ago': '08', 'aug': '08', 'agosto': '08',
-            'sep': '09', 'sept': '09', 'septiembre': '09',
-            'oct': '10', 'octubre': '10',
-            'nov': '11', 'noviembre': '11',
-            'dic': '12', 'dec': '12', 'diciembre': '12'
-        }
-        
-        parsed = []
-        for date_str in date_strings:
-            try:
-                parts = str(date_str).lower().split('-')
-                if len(parts) >= 2:
-                    month = months.get(parts[0], '01')
-                    year = parts[1]
-                    if len(year) == 2:
-                        year = '20' + year
-                    parsed.append(f"{year}-{month}-01")
-                else:
-                    parsed.append(None)
-            except:
-                parsed.append(None)
-        return parsed
-    
-    def generate_charts(self):
-        """Generate all charts as images"""
+        parts = pd.Series(date_strings, dtype=str).str.lower().str.split('-', expand=True)
+        if parts.shape[1] < 2:
+            return pd.DatetimeIndex([pd.NaT] * len(parts))
+        
+        month = parts[0].map(self.MONTHS).fillna('01')
+        year = parts[1].where(parts[1].str.len() != 2, '20' + parts[1])
+        return pd.DatetimeIndex(pd.to_datetime(year + '-' + month + '-01', format='%Y-%m-%d', errors='coerce'))
+
+    def _compute_totals(self):
+        """Cache row-wise ore, overburden and total material sums as numpy arrays"""
+        ore_cols = [col for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar'] if col in self.have]
+        overburden_cols = [col for col in ['Overburden_RGM', 'Overburden_Sar'] if col in self.have]
+        material_cols = [col for col in self.clean_df.columns if 'Ore_Mined' in col or 'Overburden' in col]
+        self.total_ore = self.clean_df[ore_cols].to_numpy(dtype=float).sum(axis=1)
+        self.total_overburden = self.clean_df[overburden_cols].to_numpy(dtype=float).sum(axis=1)
+        self.total_material = self.clean_df[material_cols].to_numpy(dtype=float).sum(axis=1)
+
+    @staticmethod
+    def _ratio(num, den):
+        """Divide two series, NaN where the denominator is not positive"""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.full(len(den), np.nan), where=den > 0)
+
+    @staticmethod
+    def _styled_cell(ws, value, font, fill=None, alignment=None):
+        """Build a write-only cell using the shared style objects"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = font
+        if fill:
+            cell.fill = fill
+        if alignment:
+            cell.alignment = alignment
+        return cell
+
+    @staticmethod
+    def _new_figure():
+        """Return a cleared 2x2 chart grid, reusing this process's chart figure"""
+        global _chart_fig
+        if _chart_fig is None:
+            # Built outside pyplot so no global figure registry pins it
+            _chart_fig = Figure(figsize=(15, 10), dpi=CHART_DPI)
+            FigureCanvasAgg(_chart_fig)
+        else:
+            _chart_fig.clear()
+        return _chart_fig, _chart_fig.subplots(2, 2)
+
+    @classmethod
+    def _apply_date_axis(cls, ax):
+        """Label a time-series x axis every 6 months as 'Mon-yy', rotated 45 degrees"""
+        # Locators bind to their axis, so each axis still needs its own
+        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
+        ax.xaxis.set_major_formatter(cls.DATE_FORMATTER)
+        ax.tick_params(axis='x', labelrotation=45)
+
+    @staticmethod
+    def _png_bytes(fig):
+        """Render the figure and encode the Agg buffer to PNG bytes with Pillow, skipping savefig"""
+        fig.canvas.draw()
+        buf = io.BytesIO()
+        PILImage.fromarray(np.asarray(fig.canvas.buffer_rgba())).save(buf, 'PNG', **PNG_SAVE)
+        return buf.getvalue()
+
+    def __getstate__(self):
+        """Chart workers only need the processed data"""
+        state = self.__dict__.copy()
+        state['df'] = None
+        return state
+
+    def _start_charts(self, executor):
+        """Submit every chart to the worker pool; returns (name, future) pairs"""
         print("\n📊 Generating charts...")
         
-        chart_files = []
-        
-        # 1. Production Overview
-        print("   Creating Production Overview...")
-        file1 = self._create_production_overview()
-        if file1:
-            chart_files.append(('Production Overview', file1))
-        
-        # 2. Efficiency Metrics
-        print("   Creating Efficiency Analysis...")
-        file2 = self._create_efficiency_charts()
-        if file2:
-            chart_files.append(('Efficiency Analysis', file2))
-        
-        # 3. Comparative Analysis
-        print("   Creating Comparative Analysis...")
-        file3 = self._create_comparative_charts()
-        if file3:
-            chart_files.append(('Comparative Analysis', file3))
-        
-        # 4. Trend Analysis
-        print("   Creating Trend Analysis...")
-        file4 = self._create_trend_charts()
-        if file4:
-            chart_files.append(('Trend Analysis', file4))
-        
-        print(f"✅ Generated {len(chart_files)} chart sets")
-        return chart_files
+        chart_makers = [
+            ('Production Overview', self._create_production_overview),
+            ('Efficiency Analysis', self._create_efficiency_charts),
+            ('Comparative Analysis', self._create_comparative_charts),
+            ('Trend Analysis', self._create_trend_charts),
+        ]
+        
+        futures = []
+        for name, maker in chart_makers:
+            print(f"   Creating {name}...")
+            futures.append((name, executor.submit(maker)))
+        return futures
+
+    @staticmethod
+    def _finish_charts(futures):
+        """Wait for the submitted charts and keep the ones that produced an image"""
+        chart_images = [(name, future.result()) for name, future in futures]
+        chart_images = [(name, png) for name, png in chart_images if png]
+        
+        print(f"✅ Generated {len(chart_images)} chart sets")
+        return chart_images
+
+    def generate_charts(self):
+        """Generate all charts as (name, PNG bytes) pairs"""
+        # Agg drawing holds the GIL, so each chart renders in its own process
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            return self._finish_charts(self._start_charts(executor))
     
     def _create_production_overview(self):
         """Create production overview charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not self.have & {'Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar'}:
+            return None
+        
+        fig, axes = self._new_figure()
         fig.suptitle('Production Overview', fontsize=16, fontweight='bold')
         
         # Chart 1: Ore Mined Comparison
         ax1 = axes[0, 0]
         plotted = False
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], 
-                    marker='o', label='RGM', linewidth=2, markersize=4)
+        if 'Ore_Mined_RGM' in self.have:
+            ax1.plot(self.dates, self.clean_df['Ore_Mined_RGM'], 
+                    marker='o', label='RGM', linewidth=2, markersize=4, markevery=self.markevery)
             plotted = True
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_Sar'], 
-                    marker='s', label='Sar', linewidth=2, markersize=4)
+        if 'Ore_Mined_Sar' in self.have:
+            ax1.plot(self.dates, self.clean_df['Ore_Mined_Sar'], 
+                    marker='s', label='Sar', linewidth=2, markersize=4, markevery=self.markevery)
             plotted = True
         
         if plotted:
@@ -224,20 +316,18 @@ class MiningDataChartGenerator:
             ax1.set_ylabel('Ore Mined (kt)')
             ax1.legend()
             ax1.grid(True, alpha=0.3)
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax1.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax1)
         
         # Chart 2: Overburden Comparison
         ax2 = axes[0, 1]
         plotted = False
-        if 'Overburden_RGM' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_RGM'], 
-                    marker='o', label='RGM', linewidth=2, markersize=4, color='orange')
+        if 'Overburden_RGM' in self.have:
+            ax2.plot(self.dates, self.clean_df['Overburden_RGM'], 
+                    marker='o', label='RGM', linewidth=2, markersize=4, markevery=self.markevery, color='orange')
             plotted = True
-        if 'Overburden_Sar' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_Sar'], 
-                    marker='s', label='Sar', linewidth=2, markersize=4, color='green')
+        if 'Overburden_Sar' in self.have:
+            ax2.plot(self.dates, self.clean_df['Overburden_Sar'], 
+                    marker='s', label='Sar', linewidth=2, markersize=4, markevery=self.markevery, color='green')
             plotted = True
             
         if plotted:
@@ -246,51 +336,36 @@ class MiningDataChartGenerator:
             ax2.set_ylabel('Overburden (kt)')
             ax2.legend()
             ax2.grid(True, alpha=0.3)
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax2)
         
         # Chart 3: Total Material Movement
         ax3 = axes[1, 0]
-        total_ore = pd.Series(0, index=self.clean_df.index)
-        total_overburden = pd.Series(0, index=self.clean_df.index)
-        
-        for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar']:
-            if col in self.clean_df.columns:
-                total_ore += self.clean_df[col]
-                
-        for col in ['Overburden_RGM', 'Overburden_Sar']:
-            if col in self.clean_df.columns:
-                total_overburden += self.clean_df[col]
+        total_ore = self.total_ore
+        total_overburden = self.total_overburden
         
         if total_ore.sum() > 0 or total_overburden.sum() > 0:
-            ax3.bar(self.clean_df.index, total_ore, label='Total Ore', alpha=0.7, color='skyblue')
-            ax3.bar(self.clean_df.index, total_overburden, bottom=total_ore, 
-                   label='Total Overburden', alpha=0.7, color='coral')
+            ax3.stackplot(self.dates, np.vstack([total_ore, total_overburden]),
+                         labels=['Total Ore', 'Total Overburden'], colors=['skyblue', 'coral'], alpha=0.7)
             ax3.set_title('Total Material Movement', fontweight='bold')
             ax3.set_xlabel('Date')
             ax3.set_ylabel('Material (kt)')
             ax3.legend()
             ax3.grid(True, alpha=0.3, axis='y')
-            ax3.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax3.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax3)
         
         # Chart 4: Strip Ratio
         ax4 = axes[1, 1]
         plotted = False
-        if 'Overburden_RGM' in self.clean_df.columns and 'Ore_Mined_RGM' in self.clean_df.columns:
-            strip_ratio_rgm = self.clean_df['Overburden_RGM'] / (self.clean_df['Ore_Mined_RGM'] + 0.001)
-            strip_ratio_rgm = strip_ratio_rgm.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, strip_ratio_rgm, marker='o', 
-                    label='RGM Strip Ratio', linewidth=2, markersize=4)
+        if 'Overburden_RGM' in self.have and 'Ore_Mined_RGM' in self.have:
+            strip_ratio_rgm = self._ratio(self.clean_df['Overburden_RGM'], self.clean_df['Ore_Mined_RGM'])
+            ax4.plot(self.dates, strip_ratio_rgm, marker='o', 
+                    label='RGM Strip Ratio', linewidth=2, markersize=4, markevery=self.markevery)
             plotted = True
             
-        if 'Overburden_Sar' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            strip_ratio_sar = self.clean_df['Overburden_Sar'] / (self.clean_df['Ore_Mined_Sar'] + 0.001)
-            strip_ratio_sar = strip_ratio_sar.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, strip_ratio_sar, marker='s', 
-                    label='Sar Strip Ratio', linewidth=2, markersize=4)
+        if 'Overburden_Sar' in self.have and 'Ore_Mined_Sar' in self.have:
+            strip_ratio_sar = self._ratio(self.clean_df['Overburden_Sar'], self.clean_df['Ore_Mined_Sar'])
+            ax4.plot(self.dates, strip_ratio_sar, marker='s', 
+                    label='Sar Strip Ratio', linewidth=2, markersize=4, markevery=self.markevery)
             plotted = True
             
         if plotted:
@@ -299,113 +374,89 @@ class MiningDataChartGenerator:
             ax4.set_ylabel('Strip Ratio')
             ax4.legend()
             ax4.grid(True, alpha=0.3)
-            ax4.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax4.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'production_overview.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        return filename
+            self._apply_date_axis(ax4)
+        
+        fig.subplots_adjust(**CHART_MARGINS)
+        return self._png_bytes(fig)
     
     def _create_efficiency_charts(self):
         """Create efficiency analysis charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not self.have & {'Active_Fleet_Count_Aprox', 'Liter_of_Diesel_Consumed'}:
+            return None
+        
+        fig, axes = self._new_figure()
         fig.suptitle('Efficiency Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Fleet vs Production
         ax1 = axes[0, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns:
-            total_production = pd.Series(0, index=self.clean_df.index)
-            for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar']:
-                if col in self.clean_df.columns:
-                    total_production += self.clean_df[col]
-            
+        if 'Active_Fleet_Count_Aprox' in self.have:
             ax1_twin = ax1.twinx()
-            ax1.bar(self.clean_df.index, total_production, alpha=0.5, 
+            ax1.bar(self.dates, self.total_ore, alpha=0.5, 
                    color='skyblue', label='Total Ore Production')
-            ax1_twin.plot(self.clean_df.index, self.clean_df['Active_Fleet_Count_Aprox'], 
-                         color='red', marker='o', linewidth=2, markersize=4, 
+            ax1_twin.plot(self.dates, self.clean_df['Active_Fleet_Count_Aprox'], 
+                         color='red', marker='o', linewidth=2, markersize=4, markevery=self.markevery, 
                          label='Fleet Count')
             
             ax1.set_xlabel('Date')
             ax1.set_ylabel('Ore Production (kt)', color='blue')
             ax1_twin.set_ylabel('Fleet Count', color='red')
             ax1.set_title('Fleet Utilization vs Production', fontweight='bold')
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax1.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax1)
             ax1.grid(True, alpha=0.3)
         
         # Chart 2: Diesel Consumption
         ax2 = axes[0, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
+        if 'Liter_of_Diesel_Consumed' in self.have:
             diesel_ml = self.clean_df['Liter_of_Diesel_Consumed'] / 1000000
-            ax2.plot(self.clean_df.index, diesel_ml, 
-                    marker='o', color='green', linewidth=2, markersize=4)
-            ax2.fill_between(self.clean_df.index, diesel_ml, alpha=0.3, color='green')
+            ax2.plot(self.dates, diesel_ml, 
+                    marker='o', color='green', linewidth=2, markersize=4, markevery=self.markevery)
+            ax2.fill_between(self.dates, diesel_ml, alpha=0.3, color='green')
             ax2.set_title('Diesel Consumption Trend', fontweight='bold')
             ax2.set_xlabel('Date')
             ax2.set_ylabel('Diesel (Million Liters)')
             ax2.grid(True, alpha=0.3)
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax2)
         
         # Chart 3: Productivity per Fleet Unit
         ax3 = axes[1, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns:
-            total_material = pd.Series(0, index=self.clean_df.index)
-            for col in self.clean_df.columns:
-                if 'Ore_Mined' in col or 'Overburden' in col:
-                    total_material += self.clean_df[col]
-            
-            productivity = total_material / (self.clean_df['Active_Fleet_Count_Aprox'] + 0.001)
-            ax3.plot(self.clean_df.index, productivity, marker='o', 
-                    color='purple', linewidth=2, markersize=4)
+        if 'Active_Fleet_Count_Aprox' in self.have:
+            productivity = self._ratio(self.total_material, self.clean_df['Active_Fleet_Count_Aprox'])
+            ax3.plot(self.dates, productivity, marker='o', 
+                    color='purple', linewidth=2, markersize=4, markevery=self.markevery)
             ax3.set_title('Productivity per Fleet Unit', fontweight='bold')
             ax3.set_xlabel('Date')
             ax3.set_ylabel('Material per Unit (kt)')
             ax3.grid(True, alpha=0.3)
-            ax3.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax3.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax3)
         
         # Chart 4: Fuel Efficiency
         ax4 = axes[1, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            total_material = pd.Series(0, index=self.clean_df.index)
-            for col in self.clean_df.columns:
-                if 'Ore_Mined' in col or 'Overburden' in col:
-                    total_material += self.clean_df[col]
-            
-            fuel_efficiency = self.clean_df['Liter_of_Diesel_Consumed'] / (total_material + 0.001)
-            fuel_efficiency = fuel_efficiency.replace([np.inf, -np.inf], np.nan)
-            ax4.plot(self.clean_df.index, fuel_efficiency, marker='o', 
-                    color='orange', linewidth=2, markersize=4)
+        if 'Liter_of_Diesel_Consumed' in self.have:
+            fuel_efficiency = self._ratio(self.clean_df['Liter_of_Diesel_Consumed'], self.total_material)
+            ax4.plot(self.dates, fuel_efficiency, marker='o', 
+                    color='orange', linewidth=2, markersize=4, markevery=self.markevery)
             ax4.set_title('Fuel Efficiency (L/kt)', fontweight='bold')
             ax4.set_xlabel('Date')
             ax4.set_ylabel('Liters per kt')
             ax4.grid(True, alpha=0.3)
-            ax4.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax4.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'efficiency_analysis.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        return filename
+            self._apply_date_axis(ax4)
+        
+        fig.subplots_adjust(**CHART_MARGINS)
+        return self._png_bytes(fig)
     
     def _create_comparative_charts(self):
         """Create comparative analysis charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        # Every panel compares both mines, so a pair of columns is needed
+        if not ({'Ore_Mined_RGM', 'Ore_Mined_Sar'} <= self.have
+                or {'Overburden_RGM', 'Overburden_Sar'} <= self.have):
+            return None
+        
+        fig, axes = self._new_figure()
         fig.suptitle('Comparative Analysis: RGM vs Sar', fontsize=16, fontweight='bold')
         
         # Chart 1: Production Share Pie Chart
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
             rgm_total = self.clean_df['Ore_Mined_RGM'].sum()
             sar_total = self.clean_df['Ore_Mined_Sar'].sum()
             
@@ -417,7 +468,7 @@ class MiningDataChartGenerator:
         
         # Chart 2: Monthly Comparison Bar Chart
         ax2 = axes[0, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
             # Sample every 3rd month for clarity
             sample_data = self.clean_df.iloc[::3]
             x = np.arange(len(sample_data))
@@ -432,13 +483,13 @@ class MiningDataChartGenerator:
             ax2.set_ylabel('Ore Mined (kt)')
             ax2.set_title('Ore Production Comparison', fontweight='bold')
             ax2.set_xticks(x)
-            ax2.set_xticklabels([d.strftime('%b-%y') for d in sample_data.index], rotation=45)
+            ax2.set_xticklabels(self.tick_labels[::3], rotation=45)
             ax2.legend()
             ax2.grid(True, alpha=0.3, axis='y')
         
         # Chart 3: Overburden Share Pie Chart
         ax3 = axes[1, 0]
-        if 'Overburden_RGM' in self.clean_df.columns and 'Overburden_Sar' in self.clean_df.columns:
+        if 'Overburden_RGM' in self.have and 'Overburden_Sar' in self.have:
             rgm_ob = self.clean_df['Overburden_RGM'].sum()
             sar_ob = self.clean_df['Overburden_Sar'].sum()
             
@@ -454,7 +505,7 @@ class MiningDataChartGenerator:
         rgm_values = []
         sar_values = []
         
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
             # Average production
             metrics.append('Avg Ore\n(kt/month)')
             rgm_values.append(self.clean_df['Ore_Mined_RGM'].mean())
@@ -484,28 +535,29 @@ class MiningDataChartGenerator:
             ax4.legend()
             ax4.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'comparative_analysis.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        return filename
+        fig.subplots_adjust(**CHART_MARGINS)
+        return self._png_bytes(fig)
     
     def _create_trend_charts(self):
         """Create trend analysis charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        if not (self.have & {'Ore_Mined_RGM', 'Ore_Mined_Sar'}
+                or {'Active_Fleet_Count_Aprox', 'Liter_of_Diesel_Consumed'} <= self.have):
+            return None
+        
+        fig, axes = self._new_figure()
         fig.suptitle('Trend Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Moving Averages
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have:
             ma_3 = self.clean_df['Ore_Mined_RGM'].rolling(window=3, center=True).mean()
             ma_6 = self.clean_df['Ore_Mined_RGM'].rolling(window=6, center=True).mean()
             
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], 
+            ax1.plot(self.dates, self.clean_df['Ore_Mined_RGM'], 
                     alpha=0.3, label='Actual', linewidth=1, color='gray')
-            ax1.plot(self.clean_df.index, ma_3, label='3-Month MA', 
+            ax1.plot(self.dates, ma_3, label='3-Month MA', 
                     linewidth=2, color='red')
-            ax1.plot(self.clean_df.index, ma_6, label='6-Month MA', 
+            ax1.plot(self.dates, ma_6, label='6-Month MA', 
                     linewidth=2, color='green')
             
             ax1.set_title('RGM Production - Moving Averages', fontweight='bold')
@@ -513,26 +565,20 @@ class MiningDataChartGenerator:
             ax1.set_ylabel('Ore Mined (kt)')
             ax1.legend()
             ax1.grid(True, alpha=0.3)
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b-%y'))
-            ax1.xaxis.set_major_locator(mdates.MonthLocator(interval=6))
-            plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+            self._apply_date_axis(ax1)
         
         # Chart 2: Year-over-Year Comparison
         ax2 = axes[0, 1]
-        yearly_data = {}
+        ore_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar']
+        cols = [col for col in ore_cols if col in self.have]
         
-        for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar']:
-            if col in self.clean_df.columns:
-                yearly = self.clean_df[col].groupby(self.clean_df.index.year).sum()
-                for year, value in yearly.items():
-                    if year not in yearly_data:
-                        yearly_data[year] = {}
-                    yearly_data[year][col] = value
-        
-        if yearly_data:
-            years = sorted(yearly_data.keys())
-            rgm_yearly = [yearly_data[y].get('Ore_Mined_RGM', 0) for y in years]
-            sar_yearly = [yearly_data[y].get('Ore_Mined_Sar', 0) for y in years]
+        if cols:
+            # One groupby gives the (year x mine) totals; a missing mine reads as 0
+            yearly = self.clean_df[cols].groupby(self.clean_df.index.year).sum()
+            yearly = yearly.reindex(columns=ore_cols, fill_value=0)
+            years = yearly.index.tolist()
+            rgm_yearly = yearly['Ore_Mined_RGM'].to_numpy()
+            sar_yearly = yearly['Ore_Mined_Sar'].to_numpy()
             
             x = np.arange(len(years))
             width = 0.35
@@ -550,9 +596,9 @@ class MiningDataChartGenerator:
         
         # Chart 3: Fleet vs Diesel Correlation
         ax3 = axes[1, 0]
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns and 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            fleet = self.clean_df['Active_Fleet_Count_Aprox']
-            diesel = self.clean_df['Liter_of_Diesel_Consumed'] / 1000000
+        if 'Active_Fleet_Count_Aprox' in self.have and 'Liter_of_Diesel_Consumed' in self.have:
+            fleet = self.clean_df['Active_Fleet_Count_Aprox'].to_numpy(dtype=float)
+            diesel = self.clean_df['Liter_of_Diesel_Consumed'].to_numpy(dtype=float) / 1000000
             
             # Remove zeros and NaNs for correlation
             mask = (fleet > 0) & (diesel > 0)
@@ -561,35 +607,35 @@ class MiningDataChartGenerator:
             
             if len(fleet_clean) > 0:
                 scatter = ax3.scatter(fleet_clean, diesel_clean, 
-                                    c=range(len(fleet_clean)), cmap='viridis', 
+                                    c=np.arange(len(fleet_clean), dtype=np.float32), cmap='viridis', 
                                     alpha=0.6, s=50)
                 
                 # Add trend line
                 z = np.polyfit(fleet_clean, diesel_clean, 1)
-                p = np.poly1d(z)
-                ax3.plot(sorted(fleet_clean), p(sorted(fleet_clean)), 
-                        "r--", alpha=0.8, label=f'Trend')
+                xs = np.sort(fleet_clean)
+                ax3.plot(xs, np.polyval(z, xs), "r--", alpha=0.8, label='Trend')
                 
                 ax3.set_xlabel('Fleet Count')
                 ax3.set_ylabel('Diesel (Million L)')
                 ax3.set_title('Fleet Count vs Diesel Consumption', fontweight='bold')
                 ax3.legend()
                 ax3.grid(True, alpha=0.3)
-                plt.colorbar(scatter, ax=ax3, label='Time')
+                fig.colorbar(scatter, ax=ax3, label='Time')
         
         # Chart 4: Monthly Seasonality
         ax4 = axes[1, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            monthly_avg = self.clean_df['Ore_Mined_RGM'].groupby(self.clean_df.index.month).mean()
+        if 'Ore_Mined_RGM' in self.have:
+            monthly = self.clean_df['Ore_Mined_RGM'].groupby(self.clean_df.index.month).mean()
+            monthly_avg = monthly.reindex(range(1, 13), fill_value=0).to_numpy()
             
             months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
             
-            bars = ax4.bar(range(1, 13), monthly_avg.reindex(range(1, 13), fill_value=0), 
+            bars = ax4.bar(range(1, 13), monthly_avg, 
                           color='steelblue', alpha=0.7)
             
             # Add average line
-            avg_line = monthly_avg.mean()
+            avg_line = monthly.mean()
             ax4.axhline(y=avg_line, color='red', linestyle='--', 
                        label=f'Overall Avg: {avg_line:.1f}')
             
@@ -601,11 +647,8 @@ class MiningDataChartGenerator:
             ax4.legend()
             ax4.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        filename = os.path.join(self.temp_dir, 'trend_analysis.png')
-        plt.savefig(filename, dpi=100, bbox_inches='tight')
-        plt.close()
-        return filename
+        fig.subplots_adjust(**CHART_MARGINS)
+        return self._png_bytes(fig)
     
     def create_excel_with_charts(self, output_file=None):
         """Create Excel file with embedded charts"""
@@ -615,121 +658,107 @@ class MiningDataChartGenerator:
         
         print("\n📝 Creating Excel file with charts...")
         
-        # Generate charts first
-        chart_files = self.generate_charts()
-        
-        # Create new workbook
-        wb = Workbook()
-        
-        # Add data sheet
-        ws_data = wb.active
-        ws_data.title = "Processed_Data"
-        
-        # Write processed data
-        for r in dataframe_to_rows(self.clean_df.reset_index(), index=False, header=True):
-            ws_data.append(r)
-        
-        # Format headers
-        for cell in ws_data[1]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill("solid", fgColor="366092")
-            cell.alignment = Alignment(horizontal="center")
-        
-        # Auto-adjust columns
-        for column in ws_data.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_data.column_dimensions[column_letter].width = adjusted_width
-        
-        # Add chart sheets
-        for sheet_name, chart_file in chart_files:
+        # Render the charts in worker processes while the data sheets are written
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            charts = self._start_charts(executor)
+            
+            # Write-only workbook: rows stream out, so sheets are built in order
+            wb = Workbook(write_only=True)
+            
+            # Add summary sheet
+            ws_summary = wb.create_sheet(title="Summary")
+            
+            # Create summary statistics
+            summary_data = [
+                ['Mining Data Analysis Summary'],
+                [''],
+                ['Metric', 'RGM', 'Sar'],
+                [''],
+            ]
+            
+            # All summary statistics in one aggregation; missing columns read as 0
+            summary_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar',
+                            'Active_Fleet_Count_Aprox', 'Liter_of_Diesel_Consumed']
+            stats = (self.clean_df[[col for col in summary_cols if col in self.have]]
+                     .agg(['sum', 'mean', 'max'])
+                     .reindex(columns=summary_cols, fill_value=0))
+            
+            if 'Ore_Mined_RGM' in self.have:
+                summary_data.append(['Total Ore (kt)', 
+                                   f"{stats.at['sum', 'Ore_Mined_RGM']:,.0f}",
+                                   f"{stats.at['sum', 'Ore_Mined_Sar']:,.0f}"])
+                summary_data.append(['Average Ore/Month (kt)', 
+                                   f"{stats.at['mean', 'Ore_Mined_RGM']:,.1f}",
+                                   f"{stats.at['mean', 'Ore_Mined_Sar']:,.1f}"])
+                summary_data.append(['Max Ore (kt)', 
+                                   f"{stats.at['max', 'Ore_Mined_RGM']:,.1f}",
+                                   f"{stats.at['max', 'Ore_Mined_Sar']:,.1f}"])
+            
+            if 'Overburden_RGM' in self.have:
+                summary_data.append(['Total Overburden (kt)', 
+                                   f"{stats.at['sum', 'Overburden_RGM']:,.0f}",
+                                   f"{stats.at['sum', 'Overburden_Sar']:,.0f}"])
+            
+            summary_data.append([''])
+            summary_data.append(['Date Range', f"{self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}"])
+            summary_data.append(['Total Periods', f"{len(self.clean_df)} months"])
+            
+            if 'Active_Fleet_Count_Aprox' in self.have:
+                summary_data.append(['Avg Fleet Count', f"{stats.at['mean', 'Active_Fleet_Count_Aprox']:,.0f}"])
+            
+            if 'Liter_of_Diesel_Consumed' in self.have:
+                summary_data.append(['Total Diesel (Million L)', 
+                                   f"{stats.at['sum', 'Liter_of_Diesel_Consumed']/1000000:,.1f}"])
+            
+            # Format summary sheet (title and header cells are styled as they are written)
+            summary_data[0] = [self._styled_cell(ws_summary, summary_data[0][0], SUMMARY_TITLE_FONT, HEADER_FILL)]
+            summary_data[2] = [self._styled_cell(ws_summary, value, BOLD_FONT) for value in summary_data[2]]
+            ws_summary.merged_cells.add('A1:C1')
+            
+            # Adjust column widths
+            ws_summary.column_dimensions['A'].width = 25
+            ws_summary.column_dimensions['B'].width = 15
+            ws_summary.column_dimensions['C'].width = 15
+            
+            # Write summary data
+            for row in summary_data:
+                ws_summary.append(row)
+            
+            # Add data sheet
+            ws_data = wb.create_sheet(title="Processed_Data")
+            data = self.clean_df.reset_index()
+            
+            # Auto-adjust columns (widths must be set before any row is written)
+            for i, col in enumerate(data.columns, start=1):
+                max_length = max(len(str(col)), data[col].map(str).str.len().max())
+                ws_data.column_dimensions[get_column_letter(i)].width = min(max_length + 2, 50)
+            
+            # Write processed data with a formatted header row
+            ws_data.append([self._styled_cell(ws_data, col, HEADER_FONT, HEADER_FILL, HEADER_ALIGN)
+                            for col in data.columns])
+            for row in self.clean_df.itertuples(index=True, name=None):
+                ws_data.append(row)
+            
+            chart_images = self._finish_charts(charts)
+        
+        # Add chart sheets (images are embedded straight from memory)
+        for sheet_name, png in chart_images:
             ws_chart = wb.create_sheet(title=sheet_name)
             
             # Add title
-            ws_chart['A1'] = sheet_name
-            ws_chart['A1'].font = Font(size=16, bold=True)
+            ws_chart.append([self._styled_cell(ws_chart, sheet_name, CHART_TITLE_FONT)])
             
             # Insert image
-            img = Image(chart_file)
+            img = Image(io.BytesIO(png))
             img.width = 1100  # Adjust size
             img.height = 750
             ws_chart.add_image(img, 'A3')
         
-        # Add summary sheet
-        ws_summary = wb.create_sheet(title="Summary", index=0)
-        
-        # Create summary statistics
-        summary_data = [
-            ['Mining Data Analysis Summary'],
-            [''],
-            ['Metric', 'RGM', 'Sar'],
-            [''],
-        ]
-        
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            summary_data.append(['Total Ore (kt)', 
-                               f"{self.clean_df['Ore_Mined_RGM'].sum():,.0f}",
-                               f"{self.clean_df.get('Ore_Mined_Sar', pd.Series([0])).sum():,.0f}"])
-            summary_data.append(['Average Ore/Month (kt)', 
-                               f"{self.clean_df['Ore_Mined_RGM'].mean():,.1f}",
-                               f"{self.clean_df.get('Ore_Mined_Sar', pd.Series([0])).mean():,.1f}"])
-            summary_data.append(['Max Ore (kt)', 
-                               f"{self.clean_df['Ore_Mined_RGM'].max():,.1f}",
-                               f"{self.clean_df.get('Ore_Mined_Sar', pd.Series([0])).max():,.1f}"])
-        
-        if 'Overburden_RGM' in self.clean_df.columns:
-            summary_data.append(['Total Overburden (kt)', 
-                               f"{self.clean_df['Overburden_RGM'].sum():,.0f}",
-                               f"{self.clean_df.get('Overburden_Sar', pd.Series([0])).sum():,.0f}"])
-        
-        summary_data.append([''])
-        summary_data.append(['Date Range', f"{self.clean_df.index[0].strftime('%b %Y')} to {self.clean_df.index[-1].strftime('%b %Y')}"])
-        summary_data.append(['Total Periods', f"{len(self.clean_df)} months"])
-        
-        if 'Active_Fleet_Count_Aprox' in self.clean_df.columns:
-            summary_data.append(['Avg Fleet Count', f"{self.clean_df['Active_Fleet_Count_Aprox'].mean():,.0f}"])
-        
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            summary_data.append(['Total Diesel (Million L)', 
-                               f"{self.clean_df['Liter_of_Diesel_Consumed'].sum()/1000000:,.1f}"])
-        
-        # Write summary data
-        for row in summary_data:
-            ws_summary.append(row)
-        
-        # Format summary sheet
-        ws_summary['A1'].font = Font(size=14, bold=True, color="FFFFFF")
-        ws_summary['A1'].fill = PatternFill("solid", fgColor="366092")
-        ws_summary.merge_cells('A1:C1')
-        
-        ws_summary['A3'].font = Font(bold=True)
-        ws_summary['B3'].font = Font(bold=True)
-        ws_summary['C3'].font = Font(bold=True)
-        
-        # Adjust column widths
-        ws_summary.column_dimensions['A'].width = 25
-        ws_summary.column_dimensions['B'].width = 15
-        ws_summary.column_dimensions['C'].width = 15
-        
         # Save workbook
         wb.save(output_file)
         
         print(f"✅ Excel file saved: {output_file}")
         
-        # Clean up temp files
-        for _, chart_file in chart_files:
-            try:
-                os.remove(chart_file)
-            except:
-                pass
-        
         return output_file
 
 
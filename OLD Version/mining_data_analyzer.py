@@ -1,14 +1,19 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from datetime import datetime
 import warnings
-warnings.filterwarnings('ignore')
+
+# Fixed margins for the 2x2 chart grids (avoids a tight_layout pass per chart)
+CHART_MARGINS = dict(left=0.06, right=0.95, top=0.92, bottom=0.09, hspace=0.45, wspace=0.25)
 
 class MiningDataAnalyzer:
+    # Spanish month abbreviations to month numbers
+    MONTHS = {'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04',
+              'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
+              'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'}
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Mining Data Analyzer")
@@ -19,6 +24,20 @@ class MiningDataAnalyzer:
         self.excel_data = None
         self.df = None
         self.sheet_names = []
+        self.have = frozenset()
+        self.tick_labels = []
+        self.dates = None
+        self.arrays = {}
+        self.total_ore = None
+        self.total_overburden = None
+        self.total_material = None
+        
+        # matplotlib is imported on the first chart generation
+        self.plt = None
+        self.FigureCanvasTkAgg = None
+        
+        # Charts whose canvas is built once they scroll into view: (placeholder, figure)
+        self.pending_charts = []
         
         # Create main frame
         self.setup_gui()
@@ -79,7 +98,7 @@ class MiningDataAnalyzer:
         )
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
         
         self.canvas.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
@@ -92,8 +111,11 @@ class MiningDataAnalyzer:
         
         if self.file_path:
             try:
-                # Read Excel file to get sheet names
-                self.excel_data = pd.ExcelFile(self.file_path)
+                # Read Excel file to get sheet names; readers warn about unsupported
+                # workbook features (validation, styles)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)
+                    self.excel_data = pd.ExcelFile(self.file_path)
                 self.sheet_names = self.excel_data.sheet_names
                 
                 # Update sheet combobox
@@ -112,7 +134,9 @@ class MiningDataAnalyzer:
         if self.sheet_combo.get():
             try:
                 # Read the selected sheet
-                self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_combo.get())
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', UserWarning)
+                    self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_combo.get())
                 self.process_data()
                 self.process_btn['state'] = 'normal'
                 self.status_label.config(text=f"Sheet '{self.sheet_combo.get()}' loaded successfully!")
@@ -120,21 +144,56 @@ class MiningDataAnalyzer:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load sheet: {str(e)}")
                 
+    @staticmethod
+    def _to_numeric(col):
+        """Convert a column to float; text cells use '.' for thousands and ',' for decimals"""
+        numbers = pd.to_numeric(col, errors='coerce')
+        if pd.api.types.infer_dtype(col, skipna=True) in ('string', 'mixed', 'mixed-integer'):
+            text = col.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+            numbers = numbers.mask(col.str.len().notna(), pd.to_numeric(text, errors='coerce'))
+        return numbers
+        
+    @staticmethod
+    def _ratio(num, den):
+        """Divide two series, NaN where the denominator is not positive"""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.full(len(den), np.nan), where=den > 0)
+        
+    @staticmethod
+    def _moving_average(values, window):
+        """Centered moving average, as rolling(window, center=True).mean(); NaN where the window is incomplete"""
+        out = np.full(len(values), np.nan)
+        if len(values) >= window:
+            means = np.convolve(values, np.ones(window), 'valid') / window
+            out[window // 2:window // 2 + len(means)] = means
+        return out
+        
+    def _parse_dates(self, date_strings):
+        """Parse 'mmm-yy' month headers to dates; anything not month-year becomes NaT"""
+        parts = pd.Series(date_strings, dtype=str).str.split('-', expand=True)
+        if parts.shape[1] < 2:
+            return pd.DatetimeIndex([pd.NaT] * len(parts))
+        
+        month = parts[0].str.lower().map(self.MONTHS).fillna('01')
+        year = parts[1].where(parts[1].str.len() != 2, '20' + parts[1])
+        parsed = pd.to_datetime(year + '-' + month + '-01', format='%Y-%m-%d', errors='coerce')
+        if parts.shape[1] > 2:
+            parsed = parsed.where(parts[2].isna())
+        return pd.DatetimeIndex(parsed)
+        
     def process_data(self):
         """Process and clean the data"""
         try:
             # Find the header row (containing months)
-            header_row = None
-            for idx, row in self.df.iterrows():
-                if any(isinstance(val, str) and 'ene-' in str(val).lower() for val in row.values):
-                    header_row = idx
-                    break
+            hits = self.df.apply(lambda col: col.astype(str).str.contains('ene-', case=False, regex=False))
+            hits = hits.any(axis=1).to_numpy()
+            header_row = int(hits.argmax()) if hits.any() else None
             
             if header_row is None:
                 # Try to identify if first row contains date-like values
-                first_row = self.df.iloc[0]
-                if any('-20' in str(val) or '-21' in str(val) or '-22' in str(val) 
-                      or '-23' in str(val) or '-24' in str(val) for val in first_row.values):
+                first_row = self.df.iloc[0].astype(str)
+                if first_row.str.contains(r'-2[0-4]', regex=True).any():
                     header_row = 0
             
             # Set the header row
@@ -146,70 +205,56 @@ class MiningDataAnalyzer:
             self.df.columns = [str(col).strip() if pd.notna(col) else f'Col_{i}' 
                               for i, col in enumerate(self.df.columns)]
             
-            # Identify metric columns (first few columns)
-            metric_cols = []
-            for col in self.df.columns[:4]:
-                if pd.notna(col) and col not in ['nan', '']:
-                    metric_cols.append(col)
+            # Keep only rows that name a metric
+            rows = self.df[self.df.iloc[:, 0].notna()]
             
-            # Create a cleaner dataframe
-            data_dict = {}
-            
-            # Extract metrics
-            for idx, row in self.df.iterrows():
-                if pd.notna(row.iloc[0]):
-                    metric_name = str(row.iloc[0]).strip()
-                    if row.iloc[1:3].notna().any():  # Has subcategory
-                        subcategory = str(row.iloc[1]) if pd.notna(row.iloc[1]) else ''
-                        unit = str(row.iloc[2]) if pd.notna(row.iloc[2]) else ''
-                        key = f"{metric_name}_{subcategory}".replace(' ', '_')
-                    else:
-                        key = metric_name.replace(' ', '_')
-                    
-                    # Get the data values (from column 3 onwards)
-                    values = []
-                    for col in self.df.columns[3:]:
-                        if '-' in str(col):  # This is a date column
-                            val = row[col]
-                            if pd.notna(val):
-                                # Clean the value
-                                if isinstance(val, str):
-                                    val = val.replace('.', '').replace(',', '.')
-                                try:
-                                    values.append(float(val))
-                                except:
-                                    values.append(np.nan)
-                            else:
-                                values.append(np.nan)
-                    
-                    if values and not all(pd.isna(values)):
-                        data_dict[key] = values
+            # Build keys: "Metric_Subcategory" when a subcategory/unit is present
+            metric = rows.iloc[:, 0].astype(str).str.strip()
+            sub = rows.iloc[:, 1].astype(str).where(rows.iloc[:, 1].notna(), '')
+            has_sub = rows.iloc[:, 1:3].notna().any(axis=1)
+            keys = metric.where(~has_sub, metric + '_' + sub).str.replace(' ', '_', regex=False)
             
-            # Get date columns
-            date_cols = [col for col in self.df.columns[3:] if '-' in str(col)]
+            # Get date columns by position, so repeated headers stay separate
+            is_date = np.array(['-' in col for col in self.df.columns], dtype=bool)
+            is_date[:3] = False
+            date_positions = np.flatnonzero(is_date)
+            date_cols = self.df.columns[date_positions].tolist()
             
-            # Create clean dataframe
-            self.clean_df = pd.DataFrame(data_dict)
-            self.clean_df['Date'] = date_cols[:len(self.clean_df)]
+            # Convert the whole date block (from column 3 onwards) to numbers in one pass over its cells
+            cells = rows.iloc[:, date_positions].to_numpy()
+            values = self._to_numeric(pd.Series(cells.ravel())).to_numpy(dtype=float).reshape(cells.shape)
             
-            # Convert date strings to datetime
-            def parse_date(date_str):
-                months = {'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04', 
-                         'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
-                         'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'}
-                parts = str(date_str).split('-')
-                if len(parts) == 2:
-                    month = months.get(parts[0].lower(), '01')
-                    year = '20' + parts[1] if len(parts[1]) == 2 else parts[1]
-                    return pd.to_datetime(f"{year}-{month}-01")
-                return pd.NaT
+            # Drop empty metrics; a repeated key keeps its first position but the last values
+            has_data = ~np.isnan(values).all(axis=1)
+            keys, values = keys[has_data], values[has_data]
+            last = ~keys.duplicated(keep='last').to_numpy()
             
-            self.clean_df['Date'] = self.clean_df['Date'].apply(parse_date)
+            # Create clean dataframe
+            self.clean_df = pd.DataFrame(values[last].T, columns=keys[last].to_list())
+            self.clean_df = self.clean_df[list(pd.unique(keys))]
+            self.clean_df['Date'] = self._parse_dates(date_cols[:len(self.clean_df)])
             self.clean_df = self.clean_df.set_index('Date').sort_index()
             
+            # Metric names for quick membership checks in the chart methods
+            self.have = frozenset(self.clean_df.columns)
+            
             # Fill NaN values with 0 for calculations
             self.clean_df = self.clean_df.fillna(0)
             
+            # Cache the ore/overburden totals the chart methods share
+            ore_cols = [col for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar'] if col in self.have]
+            overburden_cols = [col for col in ['Overburden_RGM', 'Overburden_Sar'] if col in self.have]
+            self.total_ore = self.clean_df[ore_cols].sum(axis=1)
+            self.total_overburden = self.clean_df[overburden_cols].sum(axis=1)
+            self.total_material = self.total_ore + self.total_overburden
+            
+            # Month labels shared by the categorical (bar) charts
+            self.tick_labels = self.clean_df.index.strftime('%b-%y').tolist()
+            
+            # Plain arrays for the plot calls, extracted once rather than per call
+            self.dates = self.clean_df.index.to_numpy()
+            self.arrays = {col: self.clean_df[col].to_numpy() for col in self.clean_df.columns}
+            
         except Exception as e:
             print(f"Error processing data: {str(e)}")
             messagebox.showwarning("Warning", f"Data processing had issues: {str(e)}")
@@ -220,9 +265,18 @@ class MiningDataAnalyzer:
             messagebox.showerror("Error", "No data to visualize!")
             return
         
+        # Import matplotlib on first use so the window opens without paying for it
+        if self.plt is None:
+            import matplotlib
+            matplotlib.use('Agg')  # pyplot only builds the figures; FigureCanvasTkAgg embeds them
+            import matplotlib.pyplot as plt
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.plt, self.FigureCanvasTkAgg = plt, FigureCanvasTkAgg
+        
         # Clear previous charts
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
+        self.pending_charts = []
         
         try:
             # Create charts
@@ -231,6 +285,9 @@ class MiningDataAnalyzer:
             self.create_comparative_charts()
             self.create_trend_analysis()
             
+            # Build the canvases of the charts in view once the frames are laid out
+            self.root.after_idle(self.render_visible_charts)
+            
             self.status_label.config(text="Charts generated successfully!")
             messagebox.showinfo("Success", "All charts have been generated!")
             
@@ -240,16 +297,17 @@ class MiningDataAnalyzer:
             
     def create_production_charts(self):
         """Create production-related charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        fig, axes = self.plt.subplots(2, 2, figsize=(14, 10))
+        cols, dates = self.arrays, self.dates
         fig.suptitle('Production Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Ore Mined Comparison
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], 
+        if 'Ore_Mined_RGM' in self.have:
+            ax1.plot(dates, cols['Ore_Mined_RGM'], 
                     marker='o', label='RGM', linewidth=2, markersize=4)
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_Sar'], 
+        if 'Ore_Mined_Sar' in self.have:
+            ax1.plot(dates, cols['Ore_Mined_Sar'], 
                     marker='s', label='Sar', linewidth=2, markersize=4)
         ax1.set_title('Ore Mined Over Time', fontweight='bold')
         ax1.set_xlabel('Date')
@@ -260,11 +318,11 @@ class MiningDataAnalyzer:
         
         # Chart 2: Overburden Comparison
         ax2 = axes[0, 1]
-        if 'Overburden_RGM' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_RGM'], 
+        if 'Overburden_RGM' in self.have:
+            ax2.plot(dates, cols['Overburden_RGM'], 
                     marker='o', label='RGM', linewidth=2, markersize=4)
-        if 'Overburden_Sar' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Overburden_Sar'], 
+        if 'Overburden_Sar' in self.have:
+            ax2.plot(dates, cols['Overburden_Sar'], 
                     marker='s', label='Sar', linewidth=2, markersize=4)
         ax2.set_title('Overburden Moved Over Time', fontweight='bold')
         ax2.set_xlabel('Date')
@@ -275,21 +333,13 @@ class MiningDataAnalyzer:
         
         # Chart 3: Total Material Movement
         ax3 = axes[1, 0]
-        total_ore = pd.Series(0, index=self.clean_df.index)
-        total_overburden = pd.Series(0, index=self.clean_df.index)
-        
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            total_ore += self.clean_df['Ore_Mined_RGM']
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
-            total_ore += self.clean_df['Ore_Mined_Sar']
-        if 'Overburden_RGM' in self.clean_df.columns:
-            total_overburden += self.clean_df['Overburden_RGM']
-        if 'Overburden_Sar' in self.clean_df.columns:
-            total_overburden += self.clean_df['Overburden_Sar']
-            
-        ax3.bar(self.clean_df.index, total_ore, label='Total Ore', alpha=0.7)
-        ax3.bar(self.clean_df.index, total_overburden, bottom=total_ore, 
-               label='Total Overburden', alpha=0.7)
+        # Stack both totals in one artist; skip a series with no material (both of its
+        # columns missing or zero), fixed colors keep each series' color when the other is skipped
+        material = [(self.total_ore, 'Total Ore', 'C0'), (self.total_overburden, 'Total Overburden', 'C1')]
+        material = [series for series in material if series[0].any()]
+        if material:
+            data, labels, colors = zip(*material)
+            ax3.stackplot(dates, np.vstack(data), labels=labels, colors=colors, alpha=0.7)
         ax3.set_title('Total Material Movement', fontweight='bold')
         ax3.set_xlabel('Date')
         ax3.set_ylabel('Material (kt)')
@@ -299,13 +349,13 @@ class MiningDataAnalyzer:
         
         # Chart 4: Stripping Ratio
         ax4 = axes[1, 1]
-        if 'Overburden_RGM' in self.clean_df.columns and 'Ore_Mined_RGM' in self.clean_df.columns:
-            strip_ratio_rgm = self.clean_df['Overburden_RGM'] / (self.clean_df['Ore_Mined_RGM'] + 0.001)
-            ax4.plot(self.clean_df.index, strip_ratio_rgm, marker='o', 
+        if 'Overburden_RGM' in self.have and 'Ore_Mined_RGM' in self.have:
+            strip_ratio_rgm = self._ratio(cols['Overburden_RGM'], cols['Ore_Mined_RGM'])
+            ax4.plot(dates, strip_ratio_rgm, marker='o', 
                     label='RGM Strip Ratio', linewidth=2, markersize=4)
-        if 'Overburden_Sar' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            strip_ratio_sar = self.clean_df['Overburden_Sar'] / (self.clean_df['Ore_Mined_Sar'] + 0.001)
-            ax4.plot(self.clean_df.index, strip_ratio_sar, marker='s', 
+        if 'Overburden_Sar' in self.have and 'Ore_Mined_Sar' in self.have:
+            strip_ratio_sar = self._ratio(cols['Overburden_Sar'], cols['Ore_Mined_Sar'])
+            ax4.plot(dates, strip_ratio_sar, marker='s', 
                     label='Sar Strip Ratio', linewidth=2, markersize=4)
         ax4.set_title('Stripping Ratio Trends', fontweight='bold')
         ax4.set_xlabel('Date')
@@ -314,28 +364,23 @@ class MiningDataAnalyzer:
         ax4.grid(True, alpha=0.3)
         ax4.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS)
         self.embed_chart(fig, "Production Analysis")
         
     def create_efficiency_charts(self):
         """Create efficiency and fleet utilization charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        fig, axes = self.plt.subplots(2, 2, figsize=(14, 10))
+        cols, dates = self.arrays, self.dates
         fig.suptitle('Operational Efficiency Analysis', fontsize=16, fontweight='bold')
         
         # Chart 1: Fleet Count vs Production
         ax1 = axes[0, 0]
-        if 'Active_Fleet_Count_(Aprox)' in self.clean_df.columns:
+        if 'Active_Fleet_Count_(Aprox)' in self.have:
             ax1_twin = ax1.twinx()
             
-            total_production = pd.Series(0, index=self.clean_df.index)
-            if 'Ore_Mined_RGM' in self.clean_df.columns:
-                total_production += self.clean_df['Ore_Mined_RGM']
-            if 'Ore_Mined_Sar' in self.clean_df.columns:
-                total_production += self.clean_df['Ore_Mined_Sar']
-            
-            ax1.bar(self.clean_df.index, total_production, alpha=0.5, 
+            ax1.bar(dates, self.total_ore.to_numpy(), alpha=0.5, 
                    color='skyblue', label='Total Ore Production')
-            ax1_twin.plot(self.clean_df.index, self.clean_df['Active_Fleet_Count_(Aprox)'], 
+            ax1_twin.plot(dates, cols['Active_Fleet_Count_(Aprox)'], 
                          color='red', marker='o', linewidth=2, markersize=4, 
                          label='Fleet Count')
             
@@ -353,8 +398,8 @@ class MiningDataAnalyzer:
         
         # Chart 2: Diesel Consumption Trends
         ax2 = axes[0, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            ax2.plot(self.clean_df.index, self.clean_df['Liter_of_Diesel_Consumed']/1000000, 
+        if 'Liter_of_Diesel_Consumed' in self.have:
+            ax2.plot(dates, cols['Liter_of_Diesel_Consumed']/1000000, 
                     marker='o', color='green', linewidth=2, markersize=4)
             ax2.set_title('Diesel Consumption Over Time', fontweight='bold')
             ax2.set_xlabel('Date')
@@ -364,14 +409,9 @@ class MiningDataAnalyzer:
         
         # Chart 3: Productivity per Fleet Unit
         ax3 = axes[1, 0]
-        if 'Active_Fleet_Count_(Aprox)' in self.clean_df.columns:
-            total_material = pd.Series(0, index=self.clean_df.index)
-            for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar']:
-                if col in self.clean_df.columns:
-                    total_material += self.clean_df[col]
-            
-            productivity = total_material / (self.clean_df['Active_Fleet_Count_(Aprox)'] + 0.001)
-            ax3.plot(self.clean_df.index, productivity, marker='o', 
+        if 'Active_Fleet_Count_(Aprox)' in self.have:
+            productivity = self._ratio(self.total_material, cols['Active_Fleet_Count_(Aprox)'])
+            ax3.plot(dates, productivity, marker='o', 
                     color='purple', linewidth=2, markersize=4)
             ax3.set_title('Productivity per Fleet Unit', fontweight='bold')
             ax3.set_xlabel('Date')
@@ -381,14 +421,9 @@ class MiningDataAnalyzer:
         
         # Chart 4: Fuel Efficiency
         ax4 = axes[1, 1]
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-            total_material = pd.Series(0, index=self.clean_df.index)
-            for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar']:
-                if col in self.clean_df.columns:
-                    total_material += self.clean_df[col]
-            
-            fuel_efficiency = self.clean_df['Liter_of_Diesel_Consumed'] / (total_material + 0.001)
-            ax4.plot(self.clean_df.index, fuel_efficiency, marker='o', 
+        if 'Liter_of_Diesel_Consumed' in self.have:
+            fuel_efficiency = self._ratio(cols['Liter_of_Diesel_Consumed'], self.total_material)
+            ax4.plot(dates, fuel_efficiency, marker='o', 
                     color='orange', linewidth=2, markersize=4)
             ax4.set_title('Fuel Efficiency (Liters per kt)', fontweight='bold')
             ax4.set_xlabel('Date')
@@ -396,31 +431,38 @@ class MiningDataAnalyzer:
             ax4.grid(True, alpha=0.3)
             ax4.tick_params(axis='x', rotation=45)
         
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS)
         self.embed_chart(fig, "Efficiency Analysis")
         
     def create_comparative_charts(self):
         """Create comparative analysis charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        fig, axes = self.plt.subplots(2, 2, figsize=(14, 10))
+        cols, dates = self.arrays, self.dates
         fig.suptitle('Comparative Analysis: RGM vs Sar', fontsize=16, fontweight='bold')
         
+        # Totals and averages for every panel in one aggregation; missing columns read as 0
+        mine_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar']
+        stats = (self.clean_df[[col for col in mine_cols if col in self.have]]
+                 .agg(['sum', 'mean'])
+                 .reindex(columns=mine_cols, fill_value=0))
+        
         # Chart 1: Production Share
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            rgm_total = self.clean_df['Ore_Mined_RGM'].sum()
-            sar_total = self.clean_df['Ore_Mined_Sar'].sum()
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
+            rgm_total = stats.at['sum', 'Ore_Mined_RGM']
+            sar_total = stats.at['sum', 'Ore_Mined_Sar']
             ax1.pie([rgm_total, sar_total], labels=['RGM', 'Sar'], 
                    autopct='%1.1f%%', startangle=90, colors=['#3498db', '#e74c3c'])
             ax1.set_title('Total Ore Production Share', fontweight='bold')
         
         # Chart 2: Monthly Production Comparison
         ax2 = axes[0, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have and 'Ore_Mined_Sar' in self.have:
             width = 10
             x = np.arange(len(self.clean_df.index))
-            ax2.bar(x - width/2, self.clean_df['Ore_Mined_RGM'], width, 
+            ax2.bar(x - width/2, cols['Ore_Mined_RGM'], width, 
                    label='RGM', alpha=0.7, color='#3498db')
-            ax2.bar(x + width/2, self.clean_df['Ore_Mined_Sar'], width, 
+            ax2.bar(x + width/2, cols['Ore_Mined_Sar'], width, 
                    label='Sar', alpha=0.7, color='#e74c3c')
             ax2.set_title('Monthly Ore Production Comparison', fontweight='bold')
             ax2.set_xlabel('Date')
@@ -429,47 +471,32 @@ class MiningDataAnalyzer:
             ax2.grid(True, alpha=0.3, axis='y')
             
             # Set x-axis labels (show every 6th label)
-            labels = [date.strftime('%b-%y') if i % 6 == 0 else '' 
-                     for i, date in enumerate(self.clean_df.index)]
+            labels = np.where(x % 6 == 0, self.tick_labels, '')
             ax2.set_xticks(x)
             ax2.set_xticklabels(labels, rotation=45, ha='right')
         
         # Chart 3: Overburden Share
         ax3 = axes[1, 0]
-        if 'Overburden_RGM' in self.clean_df.columns and 'Overburden_Sar' in self.clean_df.columns:
-            rgm_ob = self.clean_df['Overburden_RGM'].sum()
-            sar_ob = self.clean_df['Overburden_Sar'].sum()
+        if 'Overburden_RGM' in self.have and 'Overburden_Sar' in self.have:
+            rgm_ob = stats.at['sum', 'Overburden_RGM']
+            sar_ob = stats.at['sum', 'Overburden_Sar']
             ax3.pie([rgm_ob, sar_ob], labels=['RGM', 'Sar'], 
                    autopct='%1.1f%%', startangle=90, colors=['#9b59b6', '#f39c12'])
             ax3.set_title('Total Overburden Share', fontweight='bold')
         
         # Chart 4: Efficiency Comparison
         ax4 = axes[1, 1]
-        metrics = []
-        rgm_values = []
-        sar_values = []
-        
-        if all(col in self.clean_df.columns for col in ['Ore_Mined_RGM', 'Overburden_RGM', 
-                                                        'Ore_Mined_Sar', 'Overburden_Sar']):
-            # Average Strip Ratio
-            rgm_strip = (self.clean_df['Overburden_RGM'] / 
-                        (self.clean_df['Ore_Mined_RGM'] + 0.001)).mean()
-            sar_strip = (self.clean_df['Overburden_Sar'] / 
-                        (self.clean_df['Ore_Mined_Sar'] + 0.001)).mean()
-            
-            metrics.append('Avg Strip Ratio')
-            rgm_values.append(rgm_strip)
-            sar_values.append(sar_strip)
-            
-            # Average Production
-            metrics.append('Avg Ore (kt)')
-            rgm_values.append(self.clean_df['Ore_Mined_RGM'].mean())
-            sar_values.append(self.clean_df['Ore_Mined_Sar'].mean())
-            
-            # Total Production
-            metrics.append('Total Ore (kt/1000)')
-            rgm_values.append(self.clean_df['Ore_Mined_RGM'].sum()/1000)
-            sar_values.append(self.clean_df['Ore_Mined_Sar'].sum()/1000)
+        if all(col in self.have for col in mine_cols):
+            # One row per metric (average strip ratio, average and total production), one column per mine
+            ore_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar']
+            metrics = ['Avg Strip Ratio', 'Avg Ore (kt)', 'Total Ore (kt/1000)']
+            values = np.vstack([
+                [np.nanmean(self._ratio(cols['Overburden_RGM'], cols['Ore_Mined_RGM'])),
+                 np.nanmean(self._ratio(cols['Overburden_Sar'], cols['Ore_Mined_Sar']))],
+                stats.loc['mean', ore_cols].to_numpy(),
+                stats.loc['sum', ore_cols].to_numpy() / 1000,
+            ])
+            rgm_values, sar_values = values.T
             
             x = np.arange(len(metrics))
             width = 0.35
@@ -483,25 +510,26 @@ class MiningDataAnalyzer:
             ax4.legend()
             ax4.grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS)
         self.embed_chart(fig, "Comparative Analysis")
         
     def create_trend_analysis(self):
         """Create trend analysis and forecasting charts"""
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        fig, axes = self.plt.subplots(2, 2, figsize=(14, 10))
+        cols, dates = self.arrays, self.dates
         fig.suptitle('Trend Analysis & Insights', fontsize=16, fontweight='bold')
         
         # Chart 1: Moving Averages
         ax1 = axes[0, 0]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            ma_3 = self.clean_df['Ore_Mined_RGM'].rolling(window=3, center=True).mean()
-            ma_6 = self.clean_df['Ore_Mined_RGM'].rolling(window=6, center=True).mean()
+        if 'Ore_Mined_RGM' in self.have:
+            ma_3 = self._moving_average(cols['Ore_Mined_RGM'], 3)
+            ma_6 = self._moving_average(cols['Ore_Mined_RGM'], 6)
             
-            ax1.plot(self.clean_df.index, self.clean_df['Ore_Mined_RGM'], 
+            ax1.plot(dates, cols['Ore_Mined_RGM'], 
                     alpha=0.3, label='Actual', linewidth=1)
-            ax1.plot(self.clean_df.index, ma_3, label='3-Month MA', 
+            ax1.plot(dates, ma_3, label='3-Month MA', 
                     linewidth=2, color='red')
-            ax1.plot(self.clean_df.index, ma_6, label='6-Month MA', 
+            ax1.plot(dates, ma_6, label='6-Month MA', 
                     linewidth=2, color='green')
             ax1.set_title('RGM Ore Production - Moving Averages', fontweight='bold')
             ax1.set_xlabel('Date')
@@ -512,19 +540,16 @@ class MiningDataAnalyzer:
         
         # Chart 2: Year-over-Year Comparison
         ax2 = axes[0, 1]
-        yearly_data = {}
-        for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar']:
-            if col in self.clean_df.columns:
-                yearly = self.clean_df[col].groupby(self.clean_df.index.year).sum()
-                for year, value in yearly.items():
-                    if year not in yearly_data:
-                        yearly_data[year] = {}
-                    yearly_data[year][col] = value
-        
-        if yearly_data:
-            years = sorted(yearly_data.keys())
-            rgm_yearly = [yearly_data[y].get('Ore_Mined_RGM', 0) for y in years]
-            sar_yearly = [yearly_data[y].get('Ore_Mined_Sar', 0) for y in years]
+        ore_cols = ['Ore_Mined_RGM', 'Ore_Mined_Sar']
+        present = [col for col in ore_cols if col in self.have]
+        
+        if present:
+            # One groupby gives the (year x mine) totals; a missing mine reads as 0
+            yearly = self.clean_df[present].groupby(self.clean_df.index.year).sum()
+            yearly = yearly.reindex(columns=ore_cols, fill_value=0)
+            years = yearly.index.tolist()
+            rgm_yearly = yearly['Ore_Mined_RGM'].to_numpy()
+            sar_yearly = yearly['Ore_Mined_Sar'].to_numpy()
             
             x = np.arange(len(years))
             width = 0.35
@@ -540,35 +565,36 @@ class MiningDataAnalyzer:
         
         # Chart 3: Correlation Analysis
         ax3 = axes[1, 0]
-        if ('Active_Fleet_Count_(Aprox)' in self.clean_df.columns and 
-            'Liter_of_Diesel_Consumed' in self.clean_df.columns):
-            ax3.scatter(self.clean_df['Active_Fleet_Count_(Aprox)'], 
-                       self.clean_df['Liter_of_Diesel_Consumed']/1000000,
-                       alpha=0.6, s=50, c=range(len(self.clean_df)), cmap='viridis')
+        if ('Active_Fleet_Count_(Aprox)' in self.have and 
+            'Liter_of_Diesel_Consumed' in self.have):
+            fleet = cols['Active_Fleet_Count_(Aprox)']
+            diesel = cols['Liter_of_Diesel_Consumed'] / 1000000
+            ax3.scatter(fleet, diesel, alpha=0.6, s=50, c=np.arange(len(fleet), dtype=np.float32), cmap='viridis',
+                       rasterized=True)
             ax3.set_xlabel('Fleet Count')
             ax3.set_ylabel('Diesel Consumed (Million L)')
             ax3.set_title('Fleet Count vs Diesel Consumption', fontweight='bold')
             ax3.grid(True, alpha=0.3)
             
             # Add trend line
-            z = np.polyfit(self.clean_df['Active_Fleet_Count_(Aprox)'], 
-                          self.clean_df['Liter_of_Diesel_Consumed']/1000000, 1)
-            p = np.poly1d(z)
-            ax3.plot(sorted(self.clean_df['Active_Fleet_Count_(Aprox)']), 
-                    p(sorted(self.clean_df['Active_Fleet_Count_(Aprox)'])), 
+            z = np.polyfit(fleet, diesel, 1)
+            xs = np.sort(fleet)
+            ax3.plot(xs, np.polyval(z, xs), 
                     "r--", alpha=0.8, label=f'Trend: y={z[0]:.2f}x+{z[1]:.2f}')
             ax3.legend()
         
         # Chart 4: Monthly Seasonality
         ax4 = axes[1, 1]
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
-            monthly_avg = self.clean_df['Ore_Mined_RGM'].groupby(
+        if 'Ore_Mined_RGM' in self.have:
+            monthly = self.clean_df['Ore_Mined_RGM'].groupby(
                 self.clean_df.index.month).mean()
+            # Months with no data show as empty bars instead of breaking the 12-bar layout
+            monthly_avg = monthly.reindex(range(1, 13), fill_value=0).to_numpy()
             
             months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
             
-            ax4.bar(range(1, 13), monthly_avg.values, color='steelblue', alpha=0.7)
+            ax4.bar(range(1, 13), monthly_avg, color='steelblue', alpha=0.7)
             ax4.set_xlabel('Month')
             ax4.set_ylabel('Average Ore Mined (kt)')
             ax4.set_title('RGM Production - Monthly Seasonality', fontweight='bold')
@@ -577,12 +603,12 @@ class MiningDataAnalyzer:
             ax4.grid(True, alpha=0.3, axis='y')
             
             # Add average line
-            avg_line = monthly_avg.mean()
+            avg_line = monthly.mean()
             ax4.axhline(y=avg_line, color='red', linestyle='--', 
                        label=f'Overall Avg: {avg_line:.1f}')
             ax4.legend()
         
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS)
         self.embed_chart(fig, "Trend Analysis")
         
     def embed_chart(self, fig, title):
@@ -595,10 +621,11 @@ class MiningDataAnalyzer:
                               bg='white')
         title_label.pack(pady=5)
         
-        # Embed the chart
-        canvas = FigureCanvasTkAgg(fig, master=frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        # Reserve the figure's size; its canvas is built when it scrolls into view
+        width, height = fig.get_size_inches() * fig.dpi
+        placeholder = tk.Frame(frame, width=int(width), height=int(height), bg='white')
+        placeholder.pack(fill='both', expand=True)
+        self.pending_charts.append((placeholder, fig))
         
         # Add save button
         save_btn = tk.Button(frame, text="💾 Save Chart", 
@@ -606,6 +633,30 @@ class MiningDataAnalyzer:
                            bg='#2ecc71', fg='white', font=('Arial', 9))
         save_btn.pack(pady=5)
         
+    def on_scroll(self, first, last):
+        """Update the scrollbar and embed any chart that has come into view"""
+        self.scrollbar.set(first, last)
+        self.render_visible_charts()
+        
+    def render_visible_charts(self):
+        """Build the canvases of pending charts that intersect the visible region (laid-out ones only)"""
+        if not self.pending_charts:
+            return
+        
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        still_pending = []
+        for placeholder, fig in self.pending_charts:
+            y = placeholder.master.winfo_y() + placeholder.winfo_y()
+            if placeholder.winfo_ismapped() and y < bottom and y + placeholder.winfo_height() > top:
+                # Render when Tk is idle so the resize on packing doesn't draw it twice
+                canvas = self.FigureCanvasTkAgg(fig, master=placeholder)
+                canvas.draw_idle()
+                canvas.get_tk_widget().pack(fill='both', expand=True)
+            else:
+                still_pending.append((placeholder, fig))
+        self.pending_charts = still_pending
+        
     def save_chart(self, fig, title):
         """Save chart to file"""
         file_path = filedialog.asksaveasfilename(
@@ -615,7 +666,8 @@ class MiningDataAnalyzer:
             initialfile=f"{title.replace(' ', '_')}.png"
         )
         if file_path:
-            fig.savefig(file_path, dpi=300, bbox_inches='tight')
+            # The figure already has its fixed margins; save it as laid out on screen
+            fig.savefig(file_path, dpi=300)
             messagebox.showinfo("Success", f"Chart saved to {file_path}")
 
 def main():
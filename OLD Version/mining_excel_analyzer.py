@@ -1,52 +1,91 @@
 import pandas as pd
 import numpy as np
-from openpyxl import load_workbook
-from openpyxl.chart import (
-    LineChart, BarChart, PieChart, ScatterChart,
-    Reference, Series, DataPoint
-)
-from openpyxl.chart.axis import DateAxis
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
 import sys
 import os
 from datetime import datetime
 import warnings
-warnings.filterwarnings('ignore')
+
+# Shared cell formats, added once per workbook and reused by every sheet
+HEADER_FORMAT = {'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+                 'align': 'center', 'valign': 'vcenter'}
+PLAIN_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center'}
 
 class MiningExcelAnalyzer:
+    # Spanish month abbreviations to month numbers
+    MONTHS = {'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04',
+              'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
+              'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'}
+    
     def __init__(self, input_file, sheet_name=None):
         """Initialize the analyzer with an Excel file"""
         self.input_file = input_file
         self.sheet_name = sheet_name
         self.df = None
+        self.original_df = None
         self.clean_df = None
+        self.have = frozenset()
+        self.total_material = None
+        self.strip_ratios = {}
         self.wb = None
+        self.header_format = None
+        self.plain_header_format = None
         
     def load_and_process_data(self):
         """Load and process the Excel data"""
         print(f"Loading file: {self.input_file}")
         
-        # Read the Excel file
-        if self.sheet_name:
-            self.df = pd.read_excel(self.input_file, sheet_name=self.sheet_name)
-        else:
-            self.df = pd.read_excel(self.input_file)
+        # Read the Excel file; readers warn about unsupported workbook features (validation, styles)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            if self.sheet_name:
+                self.df = pd.read_excel(self.input_file, sheet_name=self.sheet_name)
+            else:
+                self.df = pd.read_excel(self.input_file)
             
         print(f"Data loaded: {self.df.shape[0]} rows, {self.df.shape[1]} columns")
         
+        # Keep the sheet as read for the Original_Data export; processing relabels self.df
+        self.original_df = self.df.copy(deep=False)
+        
         # Process the data
         self._process_data()
         
+    @staticmethod
+    def _to_numeric(col):
+        """Convert a column to float; text cells use '.' for thousands and ',' for decimals"""
+        numbers = pd.to_numeric(col, errors='coerce')
+        if pd.api.types.infer_dtype(col, skipna=True) in ('string', 'mixed', 'mixed-integer'):
+            text = col.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+            numbers = numbers.mask(col.str.len().notna(), pd.to_numeric(text, errors='coerce'))
+        return numbers
+        
+    @staticmethod
+    def _ratio(num, den):
+        """Divide two series, NaN where the denominator is not positive"""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        return np.divide(num, den, out=np.full(len(den), np.nan), where=den > 0)
+        
+    def _parse_dates(self, date_strings):
+        """Parse 'mmm-yy' month headers to dates; anything not month-year becomes NaT"""
+        parts = pd.Series(date_strings, dtype=str).str.split('-', expand=True)
+        if parts.shape[1] < 2:
+            return pd.DatetimeIndex([pd.NaT] * len(parts))
+        
+        month = parts[0].str.lower().map(self.MONTHS).fillna('01')
+        year = parts[1].where(parts[1].str.len() != 2, '20' + parts[1])
+        parsed = pd.to_datetime(year + '-' + month + '-01', format='%Y-%m-%d', errors='coerce')
+        if parts.shape[1] > 2:
+            parsed = parsed.where(parts[2].isna())
+        return pd.DatetimeIndex(parsed)
+        
     def _process_data(self):
         """Process and clean the data"""
         try:
             # Find the header row
-            header_row = None
-            for idx, row in self.df.iterrows():
-                if any(isinstance(val, str) and 'ene-' in str(val).lower() for val in row.values):
-                    header_row = idx
-                    break
+            hits = self.df.apply(lambda col: col.astype(str).str.contains('ene-', case=False, regex=False))
+            hits = hits.any(axis=1).to_numpy()
+            header_row = int(hits.argmax()) if hits.any() else None
             
             # Set the header row
             if header_row is not None:
@@ -57,68 +96,36 @@ class MiningExcelAnalyzer:
             self.df.columns = [str(col).strip() if pd.notna(col) else f'Col_{i}' 
                               for i, col in enumerate(self.df.columns)]
             
-            # Create a cleaner dataframe
-            data_dict = {}
-            
-            # Extract metrics
-            for idx, row in self.df.iterrows():
-                if pd.notna(row.iloc[0]):
-                    metric_name = str(row.iloc[0]).strip()
-                    if row.iloc[1:3].notna().any():  # Has subcategory
-                        subcategory = str(row.iloc[1]) if pd.notna(row.iloc[1]) else ''
-                        key = f"{metric_name}_{subcategory}".replace(' ', '_')
-                    else:
-                        key = metric_name.replace(' ', '_')
-                    
-                    # Get the data values
-                    values = []
-                    dates = []
-                    for col in self.df.columns[3:]:
-                        if '-' in str(col):  # This is a date column
-                            dates.append(str(col))
-                            val = row[col]
-                            if pd.notna(val):
-                                if isinstance(val, str):
-                                    val = val.replace('.', '').replace(',', '.')
-                                try:
-                                    values.append(float(val))
-                                except:
-                                    values.append(0)
-                            else:
-                                values.append(0)
-                    
-                    if values and not all(v == 0 for v in values):
-                        data_dict[key] = values
-            
-            # Get date columns
-            date_cols = [col for col in self.df.columns[3:] if '-' in str(col)]
+            # Keep only rows that name a metric
+            rows = self.df[self.df.iloc[:, 0].notna()]
+            
+            # Build keys: "Metric_Subcategory" when a subcategory/unit is present
+            metric = rows.iloc[:, 0].astype(str).str.strip()
+            sub = rows.iloc[:, 1].astype(str).where(rows.iloc[:, 1].notna(), '')
+            has_sub = rows.iloc[:, 1:3].notna().any(axis=1)
+            keys = metric.where(~has_sub, metric + '_' + sub).str.replace(' ', '_', regex=False)
+            
+            # Get date columns (from column 3 onwards) by position, so repeated headers stay separate
+            is_date = np.array(['-' in col for col in self.df.columns], dtype=bool)
+            is_date[:3] = False
+            date_positions = np.flatnonzero(is_date)
+            date_cols = self.df.columns[date_positions].tolist()
+            
+            # Convert the whole date block to numbers in one pass over its cells
+            cells = rows.iloc[:, date_positions].to_numpy()
+            values = self._to_numeric(pd.Series(cells.ravel())).fillna(0).to_numpy(dtype=float).reshape(cells.shape)
+            
+            # Drop all-zero metrics; a repeated key keeps its first position but the last values
+            nonzero = values.any(axis=1)
+            keys, values = keys[nonzero], values[nonzero]
+            last = ~keys.duplicated(keep='last').to_numpy()
             
             # Create clean dataframe
-            self.clean_df = pd.DataFrame(data_dict)
-            
-            # Parse dates safely
-            parsed_dates = []
-            months_map = {'ene': '01', 'feb': '02', 'mar': '03', 'abr': '04', 
-                         'may': '05', 'jun': '06', 'jul': '07', 'ago': '08',
-                         'sep': '09', 'oct': '10', 'nov': '11', 'dic': '12'}
-            
-            for date_str in date_cols[:len(self.clean_df)]:
-                try:
-                    parts = str(date_str).split('-')
-                    if len(parts) == 2:
-                        month = months_map.get(parts[0].lower(), '01')
-                        year = '20' + parts[1] if len(parts[1]) == 2 else parts[1]
-                        parsed_dates.append(f"{year}-{month}-01")
-                    else:
-                        parsed_dates.append(None)
-                except:
-                    parsed_dates.append(None)
-            
-            # Add parsed dates
-            self.clean_df['Date'] = parsed_dates
-            
-            # Convert to datetime, handling NaT values
-            self.clean_df['Date'] = pd.to_datetime(self.clean_df['Date'], errors='coerce')
+            self.clean_df = pd.DataFrame(values[last].T, columns=keys[last].to_list())
+            self.clean_df = self.clean_df[list(pd.unique(keys))]
+            
+            # Parse dates (invalid headers become NaT)
+            self.clean_df['Date'] = self._parse_dates(date_cols[:len(self.clean_df)])
             
             # Remove rows with invalid dates
             self.clean_df = self.clean_df[self.clean_df['Date'].notna()]
@@ -126,8 +133,11 @@ class MiningExcelAnalyzer:
             # Set date as index and sort
             self.clean_df = self.clean_df.set_index('Date').sort_index()
             
-            # Fill NaN values with 0 for calculations
-            self.clean_df = self.clean_df.fillna(0)
+            # Metric names for quick membership checks in the analysis sheets
+            self.have = frozenset(self.clean_df.columns)
+            
+            # Derived series shared by several analysis sheets, computed once
+            self._compute_derived()
             
             print(f"Processed data: {len(self.clean_df)} time periods, {len(self.clean_df.columns)} metrics")
             print(f"Metrics found: {', '.join(self.clean_df.columns[:10])}")
@@ -136,6 +146,19 @@ class MiningExcelAnalyzer:
             print(f"Error processing data: {str(e)}")
             raise
             
+    def _compute_derived(self):
+        """Cache the total material movement and the per-mine strip ratios"""
+        material_cols = [col for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar']
+                         if col in self.have]
+        self.total_material = self.clean_df[material_cols].sum(axis=1)
+        
+        self.strip_ratios = {}
+        for mine in ['RGM', 'Sar']:
+            if f'Overburden_{mine}' in self.have and f'Ore_Mined_{mine}' in self.have:
+                self.strip_ratios[mine] = pd.Series(self._ratio(self.clean_df[f'Overburden_{mine}'],
+                                                                self.clean_df[f'Ore_Mined_{mine}']),
+                                                    index=self.clean_df.index)
+            
     def create_excel_with_charts(self, output_file=None):
         """Create a new Excel file with data and charts"""
         if output_file is None:
@@ -144,156 +167,107 @@ class MiningExcelAnalyzer:
             
         print(f"\nCreating Excel file with charts: {output_file}")
         
-        # Create a new Excel writer
-        with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        # Create a new Excel writer; constant_memory streams each row to disk once it is written
+        with pd.ExcelWriter(output_file, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True,
+                                                       'default_date_format': 'yyyy-mm-dd'}}) as writer:
+            self.wb = writer.book
+            self.header_format = self.wb.add_format(HEADER_FORMAT)
+            self.plain_header_format = self.wb.add_format(PLAIN_HEADER_FORMAT)
             
-            # 1. Write original data
-            original_df = pd.read_excel(self.input_file, sheet_name=self.sheet_name) if self.sheet_name else pd.read_excel(self.input_file)
-            original_df.to_excel(writer, sheet_name='Original_Data', index=False)
+            # 1. Write original data (the sheet already read by load_and_process_data)
+            self._write_sheet('Original_Data', self.original_df, formatted=False)
             
             # 2. Write processed data
-            self.clean_df.to_excel(writer, sheet_name='Processed_Data')
+            self._write_sheet('Processed_Data', self.clean_df.reset_index(), formatted=False)
             
             # 3. Create summary statistics
-            self._create_summary_sheet(writer)
+            self._create_summary_sheet()
             
             # 4. Create production analysis
-            self._create_production_analysis(writer)
+            self._create_production_analysis()
             
             # 5. Create efficiency analysis
-            self._create_efficiency_analysis(writer)
+            self._create_efficiency_analysis()
             
             # 6. Create comparative analysis
-            self._create_comparative_analysis(writer)
+            self._create_comparative_analysis()
             
             # 7. Create trend analysis
-            self._create_trend_analysis(writer)
+            self._create_trend_analysis()
             
         print(f"✅ Excel file created successfully: {output_file}")
         return output_file
     
-    def _create_summary_sheet(self, writer):
+    def _create_summary_sheet(self):
         """Create a summary statistics sheet"""
-        summary_data = []
-        
-        for col in self.clean_df.columns:
-            if self.clean_df[col].dtype in ['float64', 'int64']:
-                summary_data.append({
-                    'Metric': col,
-                    'Mean': self.clean_df[col].mean(),
-                    'Std Dev': self.clean_df[col].std(),
-                    'Min': self.clean_df[col].min(),
-                    'Max': self.clean_df[col].max(),
-                    'Total': self.clean_df[col].sum()
-                })
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary_Statistics', index=False)
-        
-        # Format the sheet
-        worksheet = writer.sheets['Summary_Statistics']
-        self._format_header(worksheet)
-        
-    def _create_production_analysis(self, writer):
+        # All statistics for every numeric metric in one aggregation, one row per metric
+        numeric = self.clean_df.select_dtypes(include=['float64', 'int64'])
+        summary_df = numeric.agg(['mean', 'std', 'min', 'max', 'sum']).T
+        summary_df.columns = ['Mean', 'Std Dev', 'Min', 'Max', 'Total']
+        summary_df = summary_df.rename_axis('Metric').reset_index()
+        self._write_sheet('Summary_Statistics', summary_df)
+        
+    def _create_production_analysis(self):
         """Create production analysis sheet with data and charts"""
         production_data = pd.DataFrame()
         production_data['Date'] = self.clean_df.index
         
         # Add production metrics
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have:
             production_data['Ore_RGM'] = self.clean_df['Ore_Mined_RGM'].values
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_Sar' in self.have:
             production_data['Ore_Sar'] = self.clean_df['Ore_Mined_Sar'].values
-        if 'Overburden_RGM' in self.clean_df.columns:
+        if 'Overburden_RGM' in self.have:
             production_data['Overburden_RGM'] = self.clean_df['Overburden_RGM'].values
-        if 'Overburden_Sar' in self.clean_df.columns:
+        if 'Overburden_Sar' in self.have:
             production_data['Overburden_Sar'] = self.clean_df['Overburden_Sar'].values
             
-        # Calculate strip ratios
-        if 'Ore_RGM' in production_data.columns and 'Overburden_RGM' in production_data.columns:
-            production_data['Strip_Ratio_RGM'] = production_data['Overburden_RGM'] / (production_data['Ore_RGM'] + 0.001)
-        if 'Ore_Sar' in production_data.columns and 'Overburden_Sar' in production_data.columns:
-            production_data['Strip_Ratio_Sar'] = production_data['Overburden_Sar'] / (production_data['Ore_Sar'] + 0.001)
+        # Add strip ratios
+        for mine, ratio in self.strip_ratios.items():
+            production_data[f'Strip_Ratio_{mine}'] = ratio.values
         
         # Write to Excel
-        production_data.to_excel(writer, sheet_name='Production_Analysis', index=False)
-        
-        # Format the sheet
-        worksheet = writer.sheets['Production_Analysis']
-        self._format_header(worksheet)
-        
-        # Add charts using openpyxl
-        wb = writer.book
-        ws = wb['Production_Analysis']
+        ws = self._write_sheet('Production_Analysis', production_data)
         
         # Chart 1: Ore Production Comparison
         if 'Ore_RGM' in production_data.columns and 'Ore_Sar' in production_data.columns:
-            chart1 = LineChart()
-            chart1.title = "Ore Production Comparison"
-            chart1.x_axis.title = "Date"
-            chart1.y_axis.title = "Ore Mined (kt)"
-            
-            # Add data
-            data1 = Reference(ws, min_col=2, min_row=1, max_row=len(production_data)+1)
-            data2 = Reference(ws, min_col=3, min_row=1, max_row=len(production_data)+1)
-            dates = Reference(ws, min_col=1, min_row=2, max_row=len(production_data)+1)
-            
-            chart1.add_data(data1, titles_from_data=True)
-            chart1.add_data(data2, titles_from_data=True)
-            chart1.set_categories(dates)
-            
-            ws.add_chart(chart1, "I2")
+            chart1 = self._line_chart('Production_Analysis', production_data, ['Ore_RGM', 'Ore_Sar'],
+                                      "Ore Production Comparison", "Ore Mined (kt)")
+            ws.insert_chart("I2", chart1)
         
         # Chart 2: Strip Ratio Trends
         if 'Strip_Ratio_RGM' in production_data.columns:
-            chart2 = LineChart()
-            chart2.title = "Strip Ratio Trends"
-            chart2.x_axis.title = "Date"
-            chart2.y_axis.title = "Strip Ratio"
-            
-            col_idx = production_data.columns.get_loc('Strip_Ratio_RGM') + 1
-            data = Reference(ws, min_col=col_idx, min_row=1, max_row=len(production_data)+1)
-            dates = Reference(ws, min_col=1, min_row=2, max_row=len(production_data)+1)
-            
-            chart2.add_data(data, titles_from_data=True)
-            chart2.set_categories(dates)
-            
-            ws.add_chart(chart2, "I20")
+            chart2 = self._line_chart('Production_Analysis', production_data, ['Strip_Ratio_RGM'],
+                                      "Strip Ratio Trends", "Strip Ratio")
+            ws.insert_chart("I20", chart2)
             
-    def _create_efficiency_analysis(self, writer):
+    def _create_efficiency_analysis(self):
         """Create efficiency analysis sheet"""
         efficiency_data = pd.DataFrame()
         efficiency_data['Date'] = self.clean_df.index
         
         # Add efficiency metrics
-        if 'Active_Fleet_Count_(Aprox)' in self.clean_df.columns:
+        if 'Active_Fleet_Count_(Aprox)' in self.have:
             efficiency_data['Fleet_Count'] = self.clean_df['Active_Fleet_Count_(Aprox)'].values
             
-        if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
+        if 'Liter_of_Diesel_Consumed' in self.have:
             efficiency_data['Diesel_ML'] = self.clean_df['Liter_of_Diesel_Consumed'].values / 1000000
             
-        # Calculate total material
-        total_material = pd.Series(0, index=self.clean_df.index)
-        for col in ['Ore_Mined_RGM', 'Ore_Mined_Sar', 'Overburden_RGM', 'Overburden_Sar']:
-            if col in self.clean_df.columns:
-                total_material += self.clean_df[col]
-        efficiency_data['Total_Material_kt'] = total_material.values
+        # Add total material
+        efficiency_data['Total_Material_kt'] = self.total_material.to_numpy()
         
         # Calculate productivity metrics
         if 'Fleet_Count' in efficiency_data.columns and 'Total_Material_kt' in efficiency_data.columns:
-            efficiency_data['Productivity_per_Unit'] = efficiency_data['Total_Material_kt'] / (efficiency_data['Fleet_Count'] + 0.001)
+            efficiency_data['Productivity_per_Unit'] = self._ratio(efficiency_data['Total_Material_kt'], efficiency_data['Fleet_Count'])
             
         if 'Diesel_ML' in efficiency_data.columns and 'Total_Material_kt' in efficiency_data.columns:
-            efficiency_data['Fuel_Efficiency_L_per_kt'] = (efficiency_data['Diesel_ML'] * 1000000) / (efficiency_data['Total_Material_kt'] + 0.001)
+            efficiency_data['Fuel_Efficiency_L_per_kt'] = self._ratio(efficiency_data['Diesel_ML'] * 1000000, efficiency_data['Total_Material_kt'])
         
         # Write to Excel
-        efficiency_data.to_excel(writer, sheet_name='Efficiency_Analysis', index=False)
+        self._write_sheet('Efficiency_Analysis', efficiency_data)
         
-        # Format the sheet
-        worksheet = writer.sheets['Efficiency_Analysis']
-        self._format_header(worksheet)
-        
-    def _create_comparative_analysis(self, writer):
+    def _create_comparative_analysis(self):
         """Create comparative analysis sheet"""
         comparison_data = {}
         
@@ -304,42 +278,33 @@ class MiningExcelAnalyzer:
         rgm_values = []
         sar_values = []
         
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have:
             rgm_values.append(self.clean_df['Ore_Mined_RGM'].sum())
             rgm_values.append(self.clean_df['Ore_Mined_RGM'].mean())
         else:
             rgm_values.extend([0, 0])
             
-        if 'Ore_Mined_Sar' in self.clean_df.columns:
+        if 'Ore_Mined_Sar' in self.have:
             sar_values.append(self.clean_df['Ore_Mined_Sar'].sum())
             sar_values.append(self.clean_df['Ore_Mined_Sar'].mean())
         else:
             sar_values.extend([0, 0])
             
-        if 'Overburden_RGM' in self.clean_df.columns:
+        if 'Overburden_RGM' in self.have:
             rgm_values.append(self.clean_df['Overburden_RGM'].sum())
             rgm_values.append(self.clean_df['Overburden_RGM'].mean())
         else:
             rgm_values.extend([0, 0])
             
-        if 'Overburden_Sar' in self.clean_df.columns:
+        if 'Overburden_Sar' in self.have:
             sar_values.append(self.clean_df['Overburden_Sar'].sum())
             sar_values.append(self.clean_df['Overburden_Sar'].mean())
         else:
             sar_values.extend([0, 0])
             
-        # Calculate strip ratios
-        if 'Overburden_RGM' in self.clean_df.columns and 'Ore_Mined_RGM' in self.clean_df.columns:
-            strip_rgm = (self.clean_df['Overburden_RGM'] / (self.clean_df['Ore_Mined_RGM'] + 0.001)).mean()
-            rgm_values.append(strip_rgm)
-        else:
-            rgm_values.append(0)
-            
-        if 'Overburden_Sar' in self.clean_df.columns and 'Ore_Mined_Sar' in self.clean_df.columns:
-            strip_sar = (self.clean_df['Overburden_Sar'] / (self.clean_df['Ore_Mined_Sar'] + 0.001)).mean()
-            sar_values.append(strip_sar)
-        else:
-            sar_values.append(0)
+        # Average strip ratios
+        rgm_values.append(self.strip_ratios['RGM'].mean() if 'RGM' in self.strip_ratios else 0)
+        sar_values.append(self.strip_ratios['Sar'].mean() if 'Sar' in self.strip_ratios else 0)
         
         comparison_df = pd.DataFrame({
             'Metric': metrics,
@@ -347,77 +312,68 @@ class MiningExcelAnalyzer:
             'Sar': sar_values
         })
         
-        comparison_df.to_excel(writer, sheet_name='Comparative_Analysis', index=False)
+        self._write_sheet('Comparative_Analysis', comparison_df)
         
-        # Format the sheet
-        worksheet = writer.sheets['Comparative_Analysis']
-        self._format_header(worksheet)
-        
-    def _create_trend_analysis(self, writer):
+    def _create_trend_analysis(self):
         """Create trend analysis sheet"""
         trend_data = pd.DataFrame()
         trend_data['Date'] = self.clean_df.index
         
         # Add key metrics for trend analysis
-        if 'Ore_Mined_RGM' in self.clean_df.columns:
+        if 'Ore_Mined_RGM' in self.have:
             trend_data['Ore_RGM'] = self.clean_df['Ore_Mined_RGM'].values
             trend_data['Ore_RGM_MA3'] = self.clean_df['Ore_Mined_RGM'].rolling(window=3, center=True).mean().values
             trend_data['Ore_RGM_MA6'] = self.clean_df['Ore_Mined_RGM'].rolling(window=6, center=True).mean().values
         
-        # Yearly aggregation
-        yearly_summary = []
-        for year in self.clean_df.index.year.unique():
-            year_data = self.clean_df[self.clean_df.index.year == year]
-            
-            summary = {'Year': year}
-            if 'Ore_Mined_RGM' in self.clean_df.columns:
-                summary['Total_Ore_RGM'] = year_data['Ore_Mined_RGM'].sum()
-            if 'Ore_Mined_Sar' in self.clean_df.columns:
-                summary['Total_Ore_Sar'] = year_data['Ore_Mined_Sar'].sum()
-            if 'Liter_of_Diesel_Consumed' in self.clean_df.columns:
-                summary['Total_Diesel_ML'] = year_data['Liter_of_Diesel_Consumed'].sum() / 1000000
-            
-            yearly_summary.append(summary)
+        # Yearly aggregation: one groupby over the years instead of a row mask per year
+        yearly_names = {'Ore_Mined_RGM': 'Total_Ore_RGM', 'Ore_Mined_Sar': 'Total_Ore_Sar',
+                        'Liter_of_Diesel_Consumed': 'Total_Diesel_ML'}
+        yearly_cols = [col for col in yearly_names if col in self.have]
+        yearly_df = self.clean_df[yearly_cols].groupby(self.clean_df.index.year).sum().rename(columns=yearly_names)
+        if 'Total_Diesel_ML' in yearly_df.columns:
+            yearly_df['Total_Diesel_ML'] = yearly_df['Total_Diesel_ML'] / 1000000
+        yearly_df = yearly_df.rename_axis('Year').reset_index()
         
         # Write trend data
-        trend_data.to_excel(writer, sheet_name='Trend_Analysis', index=False)
+        self._write_sheet('Trend_Analysis', trend_data)
         
         # Write yearly summary
-        if yearly_summary:
-            yearly_df = pd.DataFrame(yearly_summary)
-            yearly_df.to_excel(writer, sheet_name='Yearly_Summary', index=False)
-            
-            # Format the sheet
-            worksheet = writer.sheets['Yearly_Summary']
-            self._format_header(worksheet)
-        
-        # Format the trend sheet
-        worksheet = writer.sheets['Trend_Analysis']
-        self._format_header(worksheet)
-        
-    def _format_header(self, worksheet):
-        """Format header row in worksheet"""
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill("solid", fgColor="366092")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        for cell in worksheet[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        if len(yearly_df):
+            self._write_sheet('Yearly_Summary', yearly_df)
+        
+    def _write_sheet(self, sheet_name, data, formatted=True):
+        """Write a frame to a new worksheet row by row, as constant_memory requires"""
+        ws = self.wb.add_worksheet(sheet_name)
+        
+        # Auto-adjust column widths from the frame instead of re-reading every cell
+        if formatted:
+            for i, col in enumerate(data.columns):
+                max_length = max(len(str(col)), data[col].map(str).str.len().max())
+                ws.set_column(i, i, min(max_length + 2, 50))
+        
+        ws.write_row(0, 0, list(data.columns), self.header_format if formatted else self.plain_header_format)
+        
+        # Missing values become None so they are left as blank cells
+        rows = data.astype(object).where(data.notna(), None).to_numpy().tolist()
+        for row_num, values in enumerate(rows, start=1):
+            ws.write_row(row_num, 0, values)
+        return ws
+        
+    def _line_chart(self, sheet_name, data, columns, title, y_title):
+        """Line chart of the given columns of a written sheet against its Date column"""
+        chart = self.wb.add_chart({'type': 'line'})
+        last_row = len(data)
+        for col in columns:
+            col_idx = data.columns.get_loc(col)
+            chart.add_series({
+                'name': [sheet_name, 0, col_idx],
+                'categories': [sheet_name, 1, 0, last_row, 0],
+                'values': [sheet_name, 1, col_idx, last_row, col_idx],
+            })
+        chart.set_title({'name': title})
+        chart.set_x_axis({'name': 'Date'})
+        chart.set_y_axis({'name': y_title})
+        return chart
 
 
 def main():